@@ -0,0 +1,175 @@
+import asyncio
+import random
+import time
+
+import httpx
+
+LEAST_OUTSTANDING = "least_outstanding"
+POWER_OF_TWO = "p2c"
+
+
+class Instance:
+    """
+    One upstream instance (origin URL) and its load / health state
+    """
+
+    def __init__(self, url: str):
+        self.url = httpx.URL(url)
+        self.outstanding = 0
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.warm_since = 0.0  # Start of the slow-start ramp; 0 = fully warm
+
+    def available(self, now: float) -> bool:
+        return self.healthy and now >= self.ejected_until
+
+    def weight(self, now: float, slow_start: float) -> float:
+        if slow_start <= 0 or not self.warm_since:
+            return 1.0
+        elapsed = now - self.warm_since
+        if elapsed >= slow_start:
+            self.warm_since = 0.0
+            return 1.0
+        return max(0.1, elapsed / slow_start)
+
+    def snapshot(self, now: float, slow_start: float) -> dict:
+        return {
+            "url": str(self.url),
+            "healthy": self.healthy,
+            "ejected": now < self.ejected_until,
+            "outstanding": self.outstanding,
+            "weight": round(self.weight(now, slow_start), 2),
+        }
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """
+    Response body wrapper that frees the instance slot once the body is closed
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class LoadBalancingTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that spreads requests for one upstream over several instances.
+
+    - Balancing: least outstanding requests, or power-of-two-choices (`p2c`)
+    - Active health checks: periodic GET `health_check_path` (any status < 500 is healthy)
+    - Passive outlier ejection: `eject_after` consecutive errors/5xx eject an
+      instance for `ejection_seconds`
+    - Slow start: an instance that rejoins ramps its weight up over `slow_start` seconds
+    """
+
+    def __init__(self, urls: list[str], transport: httpx.AsyncBaseTransport, policy: str = LEAST_OUTSTANDING,
+                 eject_after: int = 5, ejection_seconds: float = 30.0, slow_start: float = 30.0,
+                 health_check_path: str = "/", health_check_timeout: float = 1.0):
+        self.instances = [Instance(url) for url in urls]
+        self._transport = transport
+        self.policy = policy
+        self.eject_after = eject_after
+        self.ejection_seconds = ejection_seconds
+        self.slow_start = slow_start
+        self.health_check_path = health_check_path
+        self.health_check_timeout = health_check_timeout
+
+    # ---------------- BALANCING ----------------
+    def pick(self) -> Instance:
+        now = time.monotonic()
+        # If every instance is down, keep trying all of them rather than failing outright
+        candidates = [i for i in self.instances if i.available(now)] or self.instances
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.policy == POWER_OF_TWO:
+            candidates = random.sample(candidates, 2)
+        else:
+            candidates = random.sample(candidates, len(candidates))  # Random tie-break
+        return min(candidates, key=lambda i: (i.outstanding + 1) / i.weight(now, self.slow_start))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        instance = self.pick()
+        request.url = request.url.copy_with(
+            scheme=instance.url.scheme,
+            host=instance.url.host,
+            port=instance.url.port,
+        )
+        request.headers["Host"] = instance.url.netloc.decode("ascii")
+
+        instance.outstanding += 1
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            instance.outstanding -= 1
+            self._record(instance, False)
+            raise
+        self._record(instance, response.status_code < 500)
+
+        def release():
+            instance.outstanding -= 1
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    def _record(self, instance: Instance, ok: bool):
+        if ok:
+            instance.consecutive_failures = 0
+            return
+        instance.consecutive_failures += 1
+        if len(self.instances) > 1 and instance.consecutive_failures >= self.eject_after:
+            instance.consecutive_failures = 0
+            instance.ejected_until = time.monotonic() + self.ejection_seconds
+            instance.warm_since = instance.ejected_until
+
+    # ---------------- HEALTH CHECKS ----------------
+    async def check_health(self):
+        await asyncio.gather(*(self._check(instance) for instance in self.instances))
+
+    async def _check(self, instance: Instance):
+        timeout = self.health_check_timeout
+        request = httpx.Request(
+            "GET",
+            instance.url.join(self.health_check_path),
+            extensions={"timeout": {"connect": timeout, "read": timeout, "write": timeout, "pool": timeout}},
+        )
+        try:
+            response = await self._transport.handle_async_request(request)
+            await response.aread()
+            await response.aclose()
+            healthy = response.status_code < 500
+        except Exception:
+            healthy = False
+
+        if healthy and not instance.healthy:
+            instance.warm_since = time.monotonic()
+        instance.healthy = healthy
+
+    async def run_health_checks(self, interval: float):
+        while True:
+            await self.check_health()
+            await asyncio.sleep(interval)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+    def snapshot(self) -> list[dict]:
+        now = time.monotonic()
+        return [instance.snapshot(now, self.slow_start) for instance in self.instances]
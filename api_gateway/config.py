@@ -0,0 +1,89 @@
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    # ---------------- MICROSERVICE URLS ----------------
+    # Comma-separated to run several instances behind the gateway,
+    # e.g. TASK_SERVICE_URL="http://localhost:8003,http://localhost:8013"
+    AUTH_SERVICE_URL: str = "http://localhost:8001"
+    USER_SERVICE_URL: str = "http://localhost:8002"
+    TASK_SERVICE_URL: str = "http://localhost:8003"
+
+    # ---------------- UPSTREAM CONNECTION POOLS ----------------
+    # HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")
+    UPSTREAM_HTTP2: bool = False
+    UPSTREAM_KEEPALIVE_EXPIRY: float = 30.0
+    UPSTREAM_CONNECT_TIMEOUT: float = 2.0
+
+    AUTH_MAX_CONNECTIONS: int = 100
+    AUTH_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    AUTH_TIMEOUT: float = 5.0
+
+    USER_MAX_CONNECTIONS: int = 100
+    USER_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    USER_TIMEOUT: float = 5.0
+
+    TASK_MAX_CONNECTIONS: int = 100
+    TASK_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    TASK_TIMEOUT: float = 10.0
+
+    # ---------------- LOAD BALANCING / HEALTH CHECKS ----------------
+    LB_POLICY: str = "least_outstanding"  # or "p2c" (power of two choices)
+    LB_EJECT_AFTER_FAILURES: int = 5
+    LB_EJECTION_SECONDS: float = 30.0
+    LB_SLOW_START_SECONDS: float = 30.0
+    HEALTH_CHECK_INTERVAL: float = 5.0  # 0 disables active health checks
+    HEALTH_CHECK_PATH: str = "/"
+    HEALTH_CHECK_TIMEOUT: float = 1.0
+
+    # ---------------- PROXY ----------------
+    # Relay upstream response bodies as they arrive instead of buffering them
+    PROXY_STREAMING: bool = False
+    # Share one upstream call between identical concurrent idempotent requests
+    SINGLE_FLIGHT_ENABLED: bool = True
+
+    # ---------------- CIRCUIT BREAKERS (per upstream) ----------------
+    BREAKER_WINDOW: int = 50
+    BREAKER_MIN_CALLS: int = 20
+    BREAKER_FAILURE_RATIO: float = 0.5
+    BREAKER_SLOW_CALL_SECONDS: float = 2.0
+    BREAKER_OPEN_SECONDS: float = 10.0
+    BREAKER_HALF_OPEN_CALLS: int = 3
+
+    # ---------------- ADAPTIVE CONCURRENCY (AIMD, per upstream) ----------------
+    CONCURRENCY_INITIAL_LIMIT: int = 20
+    CONCURRENCY_MIN_LIMIT: int = 2
+    CONCURRENCY_MAX_LIMIT: int = 200
+    CONCURRENCY_BACKOFF: float = 0.9
+    CONCURRENCY_LATENCY_TARGET: float = 0.5
+
+    # ---------------- TOKEN VALIDATION CACHE ----------------
+    # A cached token stays valid for up to TOKEN_CACHE_TTL seconds after it is revoked
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL: float = 60.0
+    TOKEN_CACHE_NEGATIVE_TTL: float = 5.0
+
+    # ---------------- RESPONSE CACHE ----------------
+    # Per-user cache of GET /users/me and GET /tasks/{id} with ETag / 304 support
+    RESPONSE_CACHE_ENABLED: bool = False
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    RESPONSE_CACHE_TTL: float = 30.0
+
+    # ---------------- RATE LIMITING ----------------
+    # Rates are "<requests>/<seconds>" token buckets
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_IP: str = "300/60"
+    RATE_LIMIT_PER_USER: str = "120/60"
+    # Per-route overrides of the per-user rate: "METHOD /route=<requests>/<seconds>,..."
+    RATE_LIMIT_ROUTES: str = "POST /tasks=30/60"
+    RATE_LIMIT_MAX_KEYS: int = 1_000_000
+
+    # ---------------- BATCH ----------------
+    BATCH_MAX_REQUESTS: int = 50
+    BATCH_CONCURRENCY: int = 10
+
+    class Config:
+        env_file = ".env"
+
+settings = Settings()
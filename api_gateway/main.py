@@ -1,75 +1,266 @@
+import asyncio
+import json
+import re
+import time
+
 from fastapi import FastAPI, Request, HTTPException, Depends, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import httpx
 
+from config import settings
+from rate_limit import RateLimitMiddleware, limit_user, ip_limiter, user_limiter
+from response_cache import response_cache, etag_matches
+from resilience import UpstreamUnavailable, get_guard, snapshot as upstream_snapshot
+from singleflight import singleflight, request_key
+from token_cache import token_cache
+from upstream import AUTH, USER, TASK, start_clients, close_clients, get_client, instances_snapshot
+
 app = FastAPI(title="API Gateway")
+app.add_middleware(RateLimitMiddleware)
+
+
+# ---------------- UPSTREAM CLIENTS ----------------
+@app.on_event("startup")
+async def startup():
+    await start_clients()
+
 
-# ---------------- MICROSERVICE URLS ----------------
-AUTH_SERVICE = "http://localhost:8001"
-USER_SERVICE = "http://localhost:8002"
-TASK_SERVICE = "http://localhost:8003"
+@app.on_event("shutdown")
+async def shutdown():
+    await close_clients()
+
+# ---------------- CIRCUIT BREAKERS / CONCURRENCY LIMITS ----------------
+async def _guarded(name: str, send):
+    """
+    Run one upstream call through that upstream's circuit breaker and
+    adaptive concurrency limit. Fails fast with 503 + Retry-After.
+    """
+    guard = get_guard(name)
+    try:
+        guard.acquire()
+    except UpstreamUnavailable as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"{name.capitalize()} service unavailable: {e.reason}",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    started = time.monotonic()
+    try:
+        resp = await send()
+    except asyncio.CancelledError:
+        guard.abandon()
+        raise
+    except Exception:
+        guard.release(False, time.monotonic() - started)
+        raise
+    guard.release(resp.status_code < 500, time.monotonic() - started)
+    return resp
+
+
+@app.get("/debug/upstreams", tags=["Debug"])
+async def debug_upstreams():
+    """
+    Circuit breaker and concurrency limit state per upstream, plus cache stats
+    """
+    return {
+        "upstreams": upstream_snapshot(),
+        "instances": instances_snapshot(),
+        "token_cache": token_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "single_flight": singleflight.stats(),
+        "rate_limit": {"ip": ip_limiter.stats(), "user": user_limiter.stats()},
+    }
+
+# ---------------- REQUEST COALESCING ----------------
+async def _coalesced(key: tuple, send):
+    """
+    Share one upstream call between identical concurrent requests.
+    `send` must return a fully read httpx.Response.
+    """
+    if not settings.SINGLE_FLIGHT_ENABLED:
+        return await send()
+    return await singleflight.do(key, send)
 
 # ---------------- SECURITY ----------------
 security = HTTPBearer()  # Enables Swagger lock icon
 
-async def validate_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def validate_token(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
     """
     Validate the token with the auth service.
     Returns the user info if valid.
     """
-    token = credentials.credentials
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.post(
-                f"{AUTH_SERVICE}/auth/validate-token",
+    data = await _validate_token(credentials.credentials)
+    _limit_user(request, data)
+    return data
+
+
+def _limit_user(request: Request, user: dict):
+    """
+    Per-user, per-route rate limit (the per-IP limit runs earlier in RateLimitMiddleware)
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", request.url.path)
+    allowed, headers = limit_user(user.get("user_id"), request.method, route_path)
+    request.state.rate_limit_headers = headers
+    if not allowed:
+        raise HTTPException(status_code=429, detail="Too many requests", headers=headers)
+
+
+async def _validate_token(token: str) -> dict:
+    if settings.TOKEN_CACHE_ENABLED:
+        found, data = token_cache.get(token)
+        if found:
+            if data is None:
+                raise HTTPException(status_code=401, detail="Invalid token")
+            data["token"] = token
+            return data
+
+    client = get_client(AUTH)
+    try:
+        resp = await _coalesced(
+            request_key(AUTH, "POST", "/auth/validate-token", token=token),
+            lambda: _guarded(AUTH, lambda: client.post(
+                "/auth/validate-token",
                 headers={"Authorization": f"Bearer {token}"},
-                timeout=5.0
-            )
-        except httpx.RequestError:
-            raise HTTPException(status_code=503, detail="Auth service unavailable")
+            )),
+        )
+    except httpx.RequestError:
+        raise HTTPException(status_code=503, detail="Auth service unavailable")
+
+    if resp.status_code != 200:
+        if settings.TOKEN_CACHE_ENABLED and resp.status_code == 401:
+            token_cache.set_invalid(token)
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    data = resp.json()
+    if settings.TOKEN_CACHE_ENABLED:
+        token_cache.set_valid(token, data)
+    data["token"] = token  # Keep token to forward it to other services
+    return data
+
+# ---------------- STREAMING PASS-THROUGH ----------------
+# Upstream response headers relayed to the client (Link carries pagination cursors)
+_RELAYED_HEADERS = ("content-type", "link")
+
+
+def _response_headers(resp: httpx.Response) -> dict:
+    headers = {}
+    for name in _RELAYED_HEADERS:
+        if resp.headers.get(name):
+            headers[name] = resp.headers.get(name)
+    return headers
 
+
+async def _stream_upstream(client: httpx.AsyncClient, method: str, url: str, headers: dict, params=None, content: bytes = None):
+    """
+    Send a request upstream and relay the response body chunk by chunk.
+    Request bodies are sent as bytes: every route with a body validates it
+    against a schema first, so there is no raw client stream to pass through.
+    """
+    upstream_request = client.build_request(method, url, headers=headers, params=params, content=content)
+    resp = await client.send(upstream_request, stream=True)
+
+    async def body():
+        # Runs until the upstream body is exhausted or the client disconnects;
+        # either way the upstream connection is released back to the pool.
+        try:
+            async for chunk in resp.aiter_bytes():
+                yield chunk
+        finally:
+            await resp.aclose()
+
+    return StreamingResponse(body(), status_code=resp.status_code, headers=_response_headers(resp))
+
+
+# ---------------- RESPONSE CACHE ----------------
+def _cache_response(request: Request, entry) -> Response:
+    """
+    Serve a cached entry, or 304 when the client already has this version
+    """
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers={"ETag": entry.etag})
+    headers = {"ETag": entry.etag}
+    if entry.content_type:
+        headers["content-type"] = entry.content_type
+    return Response(content=entry.content, status_code=200, headers=headers)
+
+
+async def _cached_get(request: Request, user: dict, path: str, fetch):
+    """
+    Per-user response cache for GET routes (opt-in via RESPONSE_CACHE_ENABLED).
+    `fetch(stream)` proxies the request upstream.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED or request.query_params:
+        return await fetch(None)
+
+    entry = response_cache.get(user.get("user_id"), path)
+    if entry is None:
+        generation = response_cache.begin(user.get("user_id"), path)
+        try:
+            resp = await fetch(False)
+        finally:
+            current = response_cache.end(user.get("user_id"), path, generation)
         if resp.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid token")
+            return resp
+        # Not cached if a write invalidated this path while we were fetching
+        entry = response_cache.put(user.get("user_id"), path, resp.body, resp.headers.get("content-type"), store=current)
+    return _cache_response(request, entry)
 
-        data = resp.json()
-        data["token"] = token  # Keep token to forward it to other services
-        return data
 
 # ---------------- USER SERVICE PROXY ----------------
-@app.get("/users/me", tags=["Users"])
-async def proxy_me(user: dict = Depends(validate_token)):
+async def _proxy_user_me(user: dict, stream: bool = None):
     """
-    Proxy GET /users/me to the user service
+    Helper function to proxy GET /users/me to the user service
     """
+    if stream is None:
+        stream = settings.PROXY_STREAMING
     token = f"Bearer {user['token']}"
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.get(
-                f"{USER_SERVICE}/users/me",
+    client = get_client(USER)
+    try:
+        if stream:
+            return await _guarded(USER, lambda: _stream_upstream(client, "GET", "/users/me", {"Authorization": token}))
+
+        resp = await _coalesced(
+            request_key(USER, "GET", "/users/me", token=user["token"]),
+            lambda: _guarded(USER, lambda: client.get(
+                "/users/me",
                 headers={"Authorization": token},
-                timeout=5.0,
                 params=None,
-            )
-        except httpx.RequestError:
-            raise HTTPException(status_code=503, detail="User service unavailable")
+            )),
+        )
+    except httpx.RequestError:
+        raise HTTPException(status_code=503, detail="User service unavailable")
 
-        content = resp.content
-        headers = {}
-        if resp.headers.get("content-type"):
-            headers["content-type"] = resp.headers.get("content-type")
-        return Response(content=content, status_code=resp.status_code, headers=headers)
+    content = resp.content
+    return Response(content=content, status_code=resp.status_code, headers=_response_headers(resp))
+
+
+@app.get("/users/me", tags=["Users"])
+async def proxy_me(request: Request, user: dict = Depends(validate_token)):
+    """
+    Proxy GET /users/me to the user service
+    """
+    return await _cached_get(request, user, "/users/me", lambda stream: _proxy_user_me(user, stream))
 
 # ---------------- TASK SERVICE PROXY ----------------
-async def _proxy_task_request(method: str, user: dict, path: str = "", body: bytes = None, query_params = None):
+async def _proxy_task_request(method: str, user: dict, path: str = "", body: bytes = None, query_params = None, stream: bool = None):
     """
-    Helper function to proxy requests to task service
+    Helper function to proxy requests to task service.
+    With `stream` (defaults to PROXY_STREAMING) the response is relayed as it arrives.
     """
+    if stream is None:
+        stream = settings.PROXY_STREAMING
     token = f"Bearer {user['token']}"
     
     if path:
-        downstream_url = f"{TASK_SERVICE}/tasks/{path}"
+        downstream_url = f"/tasks/{path}"
     else:
-        downstream_url = f"{TASK_SERVICE}/tasks"
+        downstream_url = "/tasks"
 
     # Forward headers (keep Authorization and content-type)
     forward_headers = {"Authorization": token}
@@ -77,23 +268,30 @@ async def _proxy_task_request(method: str, user: dict, path: str = "", body: byt
         forward_headers["content-type"] = "application/json"
 
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.request(
+        client = get_client(TASK)
+        if stream:
+            return await _guarded(TASK, lambda: _stream_upstream(client, method, downstream_url, forward_headers, query_params, body))
+
+        def send():
+            return _guarded(TASK, lambda: client.request(
                 method=method,
                 url=downstream_url,
                 headers=forward_headers,
                 params=query_params,
                 content=body,
-                timeout=10.0,
-            )
-        
+            ))
+
+        if method == "GET":
+            resp = await _coalesced(request_key(TASK, method, downstream_url, query_params, user["token"]), send)
+        else:
+            resp = await send()
+
         # Return downstream response verbatim
         content = resp.content
-        headers = {}
-        if resp.headers.get("content-type"):
-            headers["content-type"] = resp.headers.get("content-type")
-        return Response(content=content, status_code=resp.status_code, headers=headers)
-    
+        return Response(content=content, status_code=resp.status_code, headers=_response_headers(resp))
+
+    except HTTPException:
+        raise
     except httpx.RequestError as e:
         raise HTTPException(status_code=503, detail=f"Task service unavailable: {str(e)}")
     except Exception as e:
@@ -108,7 +306,8 @@ async def proxy_get_tasks(request: Request, user: dict = Depends(validate_token)
     return await _proxy_task_request("GET", user, "", None, request.query_params)
 
 
-from schemas import TaskCreate, TaskUpdate
+from pydantic import ValidationError
+from schemas import TaskCreate, TaskUpdate, TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete, BatchRequest, BatchResult
 
 # ... (omitted code) ...
 
@@ -122,12 +321,72 @@ async def proxy_post_tasks(task: TaskCreate, request: Request, user: dict = Depe
     return await _proxy_task_request("POST", user, "", body, request.query_params)
 
 
+def _invalidate_task(user: dict, task_id: int, resp: Response):
+    """
+    Drop the cached GET /tasks/{task_id} after a successful write
+    """
+    if resp.status_code < 400:
+        response_cache.invalidate(user.get("user_id"), f"/tasks/{task_id}")
+
+
+@app.get("/tasks/counts", tags=["Tasks"])
+async def proxy_count_tasks(request: Request, user: dict = Depends(validate_token)):
+    """
+    Proxy GET /tasks/counts to the task service
+    """
+    return await _proxy_task_request("GET", user, "counts", None, request.query_params)
+
+
+@app.get("/tasks/search", tags=["Tasks"])
+async def proxy_search_tasks(request: Request, user: dict = Depends(validate_token)):
+    """
+    Proxy GET /tasks/search to the task service
+    """
+    return await _proxy_task_request("GET", user, "search", None, request.query_params)
+
+
+@app.post("/tasks/bulk", tags=["Tasks"])
+async def proxy_post_tasks_bulk(tasks: TaskBulkCreate, request: Request, user: dict = Depends(validate_token)):
+    """
+    Proxy POST /tasks/bulk to the task service
+    """
+    body = tasks.model_dump_json().encode("utf-8")
+    return await _proxy_task_request("POST", user, "bulk", body, request.query_params)
+
+
+@app.patch("/tasks/bulk", tags=["Tasks"])
+async def proxy_patch_tasks_bulk(tasks: TaskBulkUpdate, request: Request, user: dict = Depends(validate_token)):
+    """
+    Proxy PATCH /tasks/bulk to the task service
+    """
+    body = tasks.model_dump_json(exclude_unset=True).encode("utf-8")
+    resp = await _proxy_task_request("PATCH", user, "bulk", body, request.query_params)
+    for task in tasks.tasks:
+        _invalidate_task(user, task.id, resp)
+    return resp
+
+
+@app.delete("/tasks/bulk", tags=["Tasks"])
+async def proxy_delete_tasks_bulk(tasks: TaskBulkDelete, request: Request, user: dict = Depends(validate_token)):
+    """
+    Proxy DELETE /tasks/bulk to the task service
+    """
+    body = tasks.model_dump_json().encode("utf-8")
+    resp = await _proxy_task_request("DELETE", user, "bulk", body, request.query_params)
+    for task_id in tasks.ids:
+        _invalidate_task(user, task_id, resp)
+    return resp
+
+
 @app.get("/tasks/{task_id}", tags=["Tasks"])
 async def proxy_get_task_by_id(task_id: int, request: Request, user: dict = Depends(validate_token)):
     """
     Proxy GET /tasks/{task_id} to the task service
     """
-    return await _proxy_task_request("GET", user, str(task_id), None, request.query_params)
+    return await _cached_get(
+        request, user, f"/tasks/{task_id}",
+        lambda stream: _proxy_task_request("GET", user, str(task_id), None, request.query_params, stream),
+    )
 
 
 @app.put("/tasks/{task_id}", tags=["Tasks"])
@@ -136,7 +395,9 @@ async def proxy_put_task(task_id: int, task: TaskUpdate, request: Request, user:
     Proxy PUT /tasks/{task_id} to the task service
     """
     body = task.model_dump_json(exclude_unset=True).encode("utf-8")
-    return await _proxy_task_request("PUT", user, str(task_id), body, request.query_params)
+    resp = await _proxy_task_request("PUT", user, str(task_id), body, request.query_params)
+    _invalidate_task(user, task_id, resp)
+    return resp
 
 
 @app.delete("/tasks/{task_id}", tags=["Tasks"])
@@ -144,4 +405,161 @@ async def proxy_delete_task(task_id: int, request: Request, user: dict = Depends
     """
     Proxy DELETE /tasks/{task_id} to the task service
     """
-    return await _proxy_task_request("DELETE", user, str(task_id), None, request.query_params)
+    resp = await _proxy_task_request("DELETE", user, str(task_id), None, request.query_params)
+    _invalidate_task(user, task_id, resp)
+    return resp
+
+
+# ---------------- BATCH ----------------
+def _decode_body(resp: Response):
+    """
+    Parse a buffered proxy response body as JSON (falls back to text)
+    """
+    if not resp.body:
+        return None
+    try:
+        return json.loads(resp.body)
+    except ValueError:
+        return resp.body.decode("utf-8", errors="replace")
+
+
+_TASK_ID_PATH = re.compile(r"/tasks/(\d+)")
+
+
+async def _dispatch_batch_operation(method: str, path: str, params, body: dict, user: dict) -> Response:
+    """
+    Route one batch sub-request to the same proxy helper its standalone route uses
+    """
+    if path == "/users/me" and method == "GET":
+        return await _proxy_user_me(user, stream=False)
+
+    if path == "/tasks":
+        if method == "GET":
+            return await _proxy_task_request("GET", user, "", None, params, stream=False)
+        if method == "POST":
+            payload = TaskCreate.model_validate(body or {}).model_dump_json().encode("utf-8")
+            return await _proxy_task_request("POST", user, "", payload, params, stream=False)
+
+    if path in ("/tasks/counts", "/tasks/search") and method == "GET":
+        return await _proxy_task_request("GET", user, path[len("/tasks/"):], None, params, stream=False)
+
+    if path == "/tasks/bulk":
+        if method == "POST":
+            payload = TaskBulkCreate.model_validate(body or {}).model_dump_json().encode("utf-8")
+            return await _proxy_task_request("POST", user, "bulk", payload, params, stream=False)
+        if method == "PATCH":
+            tasks = TaskBulkUpdate.model_validate(body or {})
+            payload = tasks.model_dump_json(exclude_unset=True).encode("utf-8")
+            resp = await _proxy_task_request("PATCH", user, "bulk", payload, params, stream=False)
+            for task in tasks.tasks:
+                _invalidate_task(user, task.id, resp)
+            return resp
+        if method == "DELETE":
+            tasks = TaskBulkDelete.model_validate(body or {})
+            payload = tasks.model_dump_json().encode("utf-8")
+            resp = await _proxy_task_request("DELETE", user, "bulk", payload, params, stream=False)
+            for task_id in tasks.ids:
+                _invalidate_task(user, task_id, resp)
+            return resp
+
+    if path == "/me/overview" and method == "GET":
+        return JSONResponse(await _overview(user, params))
+
+    match = _TASK_ID_PATH.fullmatch(path)
+    if match:
+        task_id = int(match.group(1))
+        if method == "GET":
+            return await _proxy_task_request("GET", user, str(task_id), None, params, stream=False)
+        if method == "PUT":
+            payload = TaskUpdate.model_validate(body or {}).model_dump_json(exclude_unset=True).encode("utf-8")
+            resp = await _proxy_task_request("PUT", user, str(task_id), payload, params, stream=False)
+            _invalidate_task(user, task_id, resp)
+            return resp
+        if method == "DELETE":
+            resp = await _proxy_task_request("DELETE", user, str(task_id), None, params, stream=False)
+            _invalidate_task(user, task_id, resp)
+            return resp
+
+    raise HTTPException(status_code=404, detail=f"Unsupported batch operation: {method} {path}")
+
+
+def _batch_route(path: str) -> str:
+    """
+    Route template of a batch sub-request path, as rate limits are keyed ("/tasks/{task_id}")
+    """
+    return "/tasks/{task_id}" if _TASK_ID_PATH.fullmatch(path) else path
+
+
+async def _run_batch_operation(operation, user: dict, limit: asyncio.Semaphore) -> BatchResult:
+    url = httpx.URL(operation.path)
+    path = url.path.rstrip("/") or "/"
+    method = operation.method.upper()
+    if settings.RATE_LIMIT_ENABLED:
+        # Each sub-request spends from its own route's bucket, as if sent on its own
+        allowed, headers = limit_user(user.get("user_id"), method, _batch_route(path))
+        if not allowed:
+            return BatchResult(
+                status=429,
+                body={"detail": "Too many requests", "retry_after": int(headers["Retry-After"])},
+            )
+
+    async with limit:
+        try:
+            resp = await _dispatch_batch_operation(method, path, url.params, operation.body, user)
+        except ValidationError as e:
+            return BatchResult(status=422, body={"detail": jsonable_encoder(e.errors(include_url=False))})
+        except HTTPException as e:
+            return BatchResult(status=e.status_code, body={"detail": e.detail})
+
+    return BatchResult(status=resp.status_code, body=_decode_body(resp))
+
+
+@app.post("/batch", response_model=list[BatchResult], tags=["Batch"])
+async def batch(batch_request: BatchRequest, user: dict = Depends(validate_token)):
+    """
+    Run several task/user sub-requests with a single token validation.
+    Sub-requests run concurrently (bounded by BATCH_CONCURRENCY); results keep request order.
+    """
+    if len(batch_request.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch accepts at most {settings.BATCH_MAX_REQUESTS} requests",
+        )
+
+    limit = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    return await asyncio.gather(
+        *(_run_batch_operation(operation, user, limit) for operation in batch_request.requests)
+    )
+
+
+# ---------------- AGGREGATION ----------------
+@app.get("/me/overview", tags=["Users"])
+async def me_overview(request: Request, user: dict = Depends(validate_token)):
+    """
+    Profile, tasks and task counts per status in one document.
+    Upstreams are queried concurrently; a failing part is reported in `errors`
+    instead of failing the whole response.
+    """
+    return await _overview(user, request.query_params)
+
+
+async def _overview(user: dict, params) -> dict:
+    parts = {
+        "user": _proxy_user_me(user, stream=False),
+        "tasks": _proxy_task_request("GET", user, "", None, params, stream=False),
+        "task_counts": _proxy_task_request("GET", user, "counts", None, None, stream=False),
+    }
+    results = await asyncio.gather(*parts.values(), return_exceptions=True)
+
+    overview = {"errors": {}}
+    for name, result in zip(parts, results):
+        overview[name] = None
+        if isinstance(result, HTTPException):
+            overview["errors"][name] = {"status": result.status_code, "detail": result.detail}
+        elif isinstance(result, Exception):
+            overview["errors"][name] = {"status": 500, "detail": f"Gateway error: {str(result)}"}
+        elif result.status_code >= 400:
+            overview["errors"][name] = {"status": result.status_code, "detail": _decode_body(result)}
+        else:
+            overview[name] = _decode_body(result)
+    return overview
@@ -0,0 +1,129 @@
+import math
+import time
+from collections import OrderedDict
+
+from fastapi.responses import JSONResponse
+
+from config import settings
+
+
+def parse_rate(value: str) -> tuple[int, float]:
+    # "60/60" -> 60 requests per 60 seconds
+    requests, seconds = value.split("/")
+    return int(requests), float(seconds)
+
+
+def parse_route_rates(value: str) -> dict[str, tuple[int, float]]:
+    # "POST /tasks=10/60,GET /tasks=120/60" -> {"POST /tasks": (10, 60.0), ...}
+    rates = {}
+    for item in value.split(","):
+        if "=" in item:
+            route, rate = item.rsplit("=", 1)
+            rates[" ".join(route.split())] = parse_rate(rate.strip())
+    return rates
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by client (user id or IP), stored as compact
+    (tokens, updated_at, period) tuples in LRU order.
+    A bucket idle for a full period is full again, so it is dropped rather than kept;
+    `max_keys` caps memory even when every key is active.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[object, tuple[float, float, float]]" = OrderedDict()
+        self.throttled = 0
+
+    def hit(self, key, capacity: int, period: float) -> tuple[bool, dict]:
+        """
+        Take one token for `key`. Returns (allowed, rate limit headers).
+        """
+        now = time.monotonic()
+        rate = capacity / period
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            tokens = float(capacity)
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        else:
+            self.throttled += 1
+        self._buckets[key] = (tokens, now, period)
+        self._evict(now)
+
+        headers = {
+            "RateLimit-Limit": str(capacity),
+            "RateLimit-Remaining": str(int(tokens)),
+            "RateLimit-Reset": str(math.ceil((capacity - tokens) / rate)),
+        }
+        if not allowed:
+            headers["Retry-After"] = str(math.ceil((1 - tokens) / rate))
+        return allowed, headers
+
+    def _evict(self, now: float):
+        while self._buckets:
+            key, (_, updated_at, period) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_keys and now - updated_at < period:
+                break
+            del self._buckets[key]
+
+    def stats(self) -> dict:
+        return {"keys": len(self._buckets), "max_keys": self.max_keys, "throttled": self.throttled}
+
+
+ip_limiter = TokenBucketLimiter(settings.RATE_LIMIT_MAX_KEYS)
+user_limiter = TokenBucketLimiter(settings.RATE_LIMIT_MAX_KEYS)
+
+_ip_rate = parse_rate(settings.RATE_LIMIT_PER_IP)
+_user_rate = parse_rate(settings.RATE_LIMIT_PER_USER)
+_route_rates = parse_route_rates(settings.RATE_LIMIT_ROUTES)
+
+
+def limit_user(user_id, method: str, route: str) -> tuple[bool, dict]:
+    """
+    Per-user limit for one route ("POST /tasks"), falling back to RATE_LIMIT_PER_USER
+    """
+    route_key = f"{method} {route}"
+    capacity, period = _route_rates.get(route_key, _user_rate)
+    return user_limiter.hit((user_id, route_key), capacity, period)
+
+
+class RateLimitMiddleware:
+    """
+    Per-IP limit applied before authentication. Also adds the rate limit
+    headers of the most specific limit (per user if set, else per IP) to responses.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        client_ip = scope["client"][0] if scope.get("client") else "unknown"
+        allowed, ip_headers = ip_limiter.hit(client_ip, *_ip_rate)
+        if not allowed:
+            response = JSONResponse({"detail": "Too many requests"}, status_code=429, headers=ip_headers)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                state = scope.get("state") or {}
+                limit_headers = state.get("rate_limit_headers") or ip_headers
+                headers = list(message.get("headers", []))
+                present = {name.lower() for name, _ in headers}
+                for name, value in limit_headers.items():
+                    if name.lower().encode("latin-1") not in present:
+                        headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
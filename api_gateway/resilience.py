@@ -0,0 +1,202 @@
+import math
+import time
+from collections import deque
+
+from config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class UpstreamUnavailable(Exception):
+    """
+    Raised before calling an upstream that is failing or saturated,
+    so the gateway can answer 503 immediately.
+    """
+
+    def __init__(self, upstream: str, reason: str, retry_after: int):
+        super().__init__(f"{upstream}: {reason}")
+        self.upstream = upstream
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Closed -> open when the failure ratio over the last `window` calls reaches
+    `failure_ratio`; a call fails on a transport error, a 5xx, or when slower
+    than `slow_call_seconds`. Open -> half-open after `open_seconds`, where up to
+    `half_open_calls` probes decide between closed and open again.
+    """
+
+    def __init__(self, window: int, min_calls: int, failure_ratio: float, slow_call_seconds: float,
+                 open_seconds: float, half_open_calls: int):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes: deque = deque(maxlen=window)  # True = failure
+        self._probes = 0
+
+    def allow(self) -> bool:
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                return False
+            self.state = HALF_OPEN
+            self._probes = 0
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_calls:
+                return False
+            self._probes += 1
+        return True
+
+    def release_probe(self):
+        """
+        Give back a half-open probe slot that was never used
+        """
+        if self.state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record(self, ok: bool, latency: float):
+        failed = not ok or latency > self.slow_call_seconds
+
+        if self.state == HALF_OPEN:
+            if failed:
+                self._open()
+            else:
+                self.state = CLOSED
+                self._outcomes.clear()
+            return
+
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_calls and self.failure_rate() >= self.failure_ratio:
+            self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def retry_after(self) -> int:
+        remaining = self.open_seconds - (time.monotonic() - self.opened_at)
+        return max(1, math.ceil(remaining))
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "failure_rate": round(self.failure_rate(), 3),
+            "calls_in_window": len(self._outcomes),
+            "retry_after": self.retry_after() if self.state == OPEN else 0,
+        }
+
+
+class AIMDLimiter:
+    """
+    Adaptive concurrency limit: grows by ~1 per limit's worth of fast successes,
+    shrinks multiplicatively on failures or calls slower than `latency_target`.
+    Requests above the limit are rejected instead of queued.
+    """
+
+    def __init__(self, initial: int, min_limit: int, max_limit: int, backoff: float, latency_target: float):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.rejected = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, ok: bool, latency: float):
+        self.in_flight -= 1
+        if ok and latency <= self.latency_target:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+        else:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+
+class UpstreamGuard:
+    """
+    Circuit breaker + concurrency limit for one upstream.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker(
+            window=settings.BREAKER_WINDOW,
+            min_calls=settings.BREAKER_MIN_CALLS,
+            failure_ratio=settings.BREAKER_FAILURE_RATIO,
+            slow_call_seconds=settings.BREAKER_SLOW_CALL_SECONDS,
+            open_seconds=settings.BREAKER_OPEN_SECONDS,
+            half_open_calls=settings.BREAKER_HALF_OPEN_CALLS,
+        )
+        self.limiter = AIMDLimiter(
+            initial=settings.CONCURRENCY_INITIAL_LIMIT,
+            min_limit=settings.CONCURRENCY_MIN_LIMIT,
+            max_limit=settings.CONCURRENCY_MAX_LIMIT,
+            backoff=settings.CONCURRENCY_BACKOFF,
+            latency_target=settings.CONCURRENCY_LATENCY_TARGET,
+        )
+
+    def acquire(self):
+        """
+        Reserve a slot for one upstream call or raise UpstreamUnavailable
+        """
+        if not self.breaker.allow():
+            raise UpstreamUnavailable(self.name, "circuit open", self.breaker.retry_after())
+        if not self.limiter.try_acquire():
+            self.breaker.release_probe()
+            raise UpstreamUnavailable(self.name, "concurrency limit reached", 1)
+
+    def release(self, ok: bool, latency: float):
+        self.limiter.release(ok, latency)
+        self.breaker.record(ok, latency)
+
+    def abandon(self):
+        """
+        Free the slot of a call that was cancelled before it completed,
+        without counting it as a success or a failure
+        """
+        self.limiter.in_flight -= 1
+        self.breaker.release_probe()
+
+    def snapshot(self) -> dict:
+        return {"breaker": self.breaker.snapshot(), "concurrency": self.limiter.snapshot()}
+
+
+_guards: dict[str, UpstreamGuard] = {}
+
+
+def get_guard(name: str) -> UpstreamGuard:
+    guard = _guards.get(name)
+    if guard is None:
+        guard = _guards[name] = UpstreamGuard(name)
+    return guard
+
+
+def snapshot() -> dict:
+    return {name: guard.snapshot() for name, guard in _guards.items()}
@@ -0,0 +1,127 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from config import settings
+
+
+@dataclass
+class CachedResponse:
+    content: bytes
+    content_type: Optional[str]
+    etag: str
+    expires_at: float
+
+
+def make_etag(content: bytes) -> str:
+    # Strong validator: changes whenever the body changes
+    return '"' + hashlib.sha256(content).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip() for tag in if_none_match.split(",")]
+
+
+class ResponseCache:
+    """
+    Per-user cache of successful GET responses, bounded by total body size (LRU).
+
+    A fetch brackets its upstream call with begin()/end(); invalidate() bumps the
+    key's generation, so a body fetched before a write is not cached after it.
+    Generations are only kept for keys with a fetch in flight.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple, CachedResponse]" = OrderedDict()
+        self._in_flight: dict[tuple, list[int]] = {}  # key -> [fetches, generation]
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id, path: str) -> Optional[CachedResponse]:
+        key = (user_id, path)
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.time():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, user_id, path: str, content: bytes, content_type: Optional[str], store: bool = True) -> CachedResponse:
+        entry = CachedResponse(
+            content=content,
+            content_type=content_type,
+            etag=make_etag(content),
+            expires_at=time.time() + self.ttl,
+        )
+        if not store or len(content) > self.max_bytes:
+            return entry  # Stale (see end()) or never fits; serve it without caching
+
+        key = (user_id, path)
+        self._remove(key)
+        self._entries[key] = entry
+        self.size_bytes += len(content)
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted.content)
+            self.evictions += 1
+        return entry
+
+    def invalidate(self, user_id, path: str):
+        key = (user_id, path)
+        self._remove(key)
+        if key in self._in_flight:
+            self._in_flight[key][1] += 1
+
+    def begin(self, user_id, path: str) -> int:
+        """
+        Register an upstream fetch for this key; returns its current generation
+        """
+        state = self._in_flight.setdefault((user_id, path), [0, 0])
+        state[0] += 1
+        return state[1]
+
+    def end(self, user_id, path: str, generation: int) -> bool:
+        """
+        Finish a fetch started with begin(); False if the key was invalidated
+        meanwhile, i.e. the fetched body may predate a write and must not be cached
+        """
+        key = (user_id, path)
+        state = self._in_flight[key]
+        state[0] -= 1
+        if state[0] == 0:
+            del self._in_flight[key]
+        return state[1] == generation
+
+    def _remove(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= len(entry.content)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL,
+)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from enum import Enum
-from typing import Optional
+from typing import Any, List, Optional
 
 class TaskStatus(str, Enum):
     pending = "pending"
@@ -16,3 +16,27 @@ class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     status: Optional[TaskStatus] = None
+
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate]
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem]
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int]
+
+class BatchOperation(BaseModel):
+    method: str
+    path: str  # e.g. "/tasks", "/tasks/5", "/tasks?offset=10", "/users/me"
+    body: Optional[dict] = None
+
+class BatchRequest(BaseModel):
+    requests: List[BatchOperation]
+
+class BatchResult(BaseModel):
+    status: int
+    body: Any = None
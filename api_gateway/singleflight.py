@@ -0,0 +1,55 @@
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Hashable
+
+
+def request_key(upstream: str, method: str, url: str, params=None, token: str = None) -> tuple:
+    """
+    Identity of an upstream call: method, URL, query and the caller's token
+    (hashed), so responses are only ever shared between requests of the same user.
+    """
+    if params is None:
+        query = ()
+    elif hasattr(params, "multi_items"):
+        query = tuple(sorted(params.multi_items()))
+    else:
+        query = tuple(sorted(params.items()))
+    auth = hashlib.sha256(token.encode("utf-8")).hexdigest() if token else None
+    return (upstream, method.upper(), url, query, auth)
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls: the first caller runs the call,
+    concurrent callers with the same key await the same result (or error).
+    Only use it for idempotent calls whose result is safe to share.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            # Run as its own task so a cancelled caller doesn't cancel the others
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved even if every caller went away
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._inflight), "calls": self.calls, "shared": self.shared}
+
+
+singleflight = SingleFlight()
@@ -0,0 +1,113 @@
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config import settings
+
+
+def _hash_token(token: str) -> str:
+    # Never keep raw bearer tokens in memory longer than the request
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _token_exp(token: str) -> Optional[float]:
+    """
+    Read the `exp` claim without verifying the signature.
+    Only used to bound the cache TTL of a token auth_service already accepted.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+class TokenCache:
+    """
+    Bounded in-process LRU cache of token validation results.
+    Valid tokens are cached for at most `ttl` seconds and never past their JWT `exp`;
+    rejected tokens are cached for `negative_ttl` seconds.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, negative_ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # key -> (expires_at, user_data or None for a rejected token)
+        self._entries: "OrderedDict[str, tuple[float, Optional[dict]]]" = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> tuple[bool, Optional[dict]]:
+        """
+        Return (found, user_data). user_data is None for a cached rejection.
+        """
+        key = _hash_token(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        expires_at, data = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        if data is None:
+            self.negative_hits += 1
+            return True, None
+        self.hits += 1
+        return True, dict(data)
+
+    def set_valid(self, token: str, data: dict):
+        now = time.time()
+        expires_at = now + self.ttl
+        exp = _token_exp(token)
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        if expires_at <= now:
+            return
+        self._put(_hash_token(token), expires_at, dict(data))
+
+    def set_invalid(self, token: str):
+        if self.negative_ttl <= 0:
+            return
+        self._put(_hash_token(token), time.time() + self.negative_ttl, None)
+
+    def _put(self, key: str, expires_at: float, data: Optional[dict]):
+        self._entries[key] = (expires_at, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.TOKEN_CACHE_TTL,
+    negative_ttl=settings.TOKEN_CACHE_NEGATIVE_TTL,
+)
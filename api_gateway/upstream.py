@@ -0,0 +1,120 @@
+import asyncio
+
+import httpx
+
+from balancer import LoadBalancingTransport
+from config import settings
+
+# ---------------- UPSTREAM NAMES ----------------
+AUTH = "auth"
+USER = "user"
+TASK = "task"
+
+# One long-lived client (and connection pool) per upstream service.
+# Created on app startup, closed on shutdown.
+_clients: dict[str, httpx.AsyncClient] = {}
+_balancers: dict[str, LoadBalancingTransport] = {}
+_health_checks: list[asyncio.Task] = []
+
+
+def _upstream_config() -> dict:
+    """
+    Instance URLs, pool limits and timeout for every upstream
+    """
+    return {
+        AUTH: (
+            settings.AUTH_SERVICE_URL,
+            settings.AUTH_MAX_CONNECTIONS,
+            settings.AUTH_MAX_KEEPALIVE_CONNECTIONS,
+            settings.AUTH_TIMEOUT,
+        ),
+        USER: (
+            settings.USER_SERVICE_URL,
+            settings.USER_MAX_CONNECTIONS,
+            settings.USER_MAX_KEEPALIVE_CONNECTIONS,
+            settings.USER_TIMEOUT,
+        ),
+        TASK: (
+            settings.TASK_SERVICE_URL,
+            settings.TASK_MAX_CONNECTIONS,
+            settings.TASK_MAX_KEEPALIVE_CONNECTIONS,
+            settings.TASK_TIMEOUT,
+        ),
+    }
+
+
+def _instance_urls(value: str) -> list[str]:
+    # "http://localhost:8003,http://localhost:8013" -> one entry per instance
+    return [url.strip().rstrip("/") for url in value.split(",") if url.strip()]
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def start_clients():
+    """
+    Create the shared upstream clients (called once on startup)
+    """
+    http2 = settings.UPSTREAM_HTTP2 and _http2_available()
+
+    for name, (service_urls, max_conn, max_keepalive, timeout) in _upstream_config().items():
+        urls = _instance_urls(service_urls)
+        balancer = LoadBalancingTransport(
+            urls,
+            httpx.AsyncHTTPTransport(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=max_conn,
+                    max_keepalive_connections=max_keepalive,
+                    keepalive_expiry=settings.UPSTREAM_KEEPALIVE_EXPIRY,
+                ),
+            ),
+            policy=settings.LB_POLICY,
+            eject_after=settings.LB_EJECT_AFTER_FAILURES,
+            ejection_seconds=settings.LB_EJECTION_SECONDS,
+            slow_start=settings.LB_SLOW_START_SECONDS,
+            health_check_path=settings.HEALTH_CHECK_PATH,
+            health_check_timeout=settings.HEALTH_CHECK_TIMEOUT,
+        )
+        _balancers[name] = balancer
+        _clients[name] = httpx.AsyncClient(
+            base_url=urls[0],  # Host is rewritten per request by the balancer
+            transport=balancer,
+            timeout=httpx.Timeout(timeout, connect=settings.UPSTREAM_CONNECT_TIMEOUT),
+        )
+
+        # Health checks only matter when there is another instance to fail over to
+        if settings.HEALTH_CHECK_INTERVAL > 0 and len(urls) > 1:
+            _health_checks.append(asyncio.create_task(balancer.run_health_checks(settings.HEALTH_CHECK_INTERVAL)))
+
+
+async def close_clients():
+    """
+    Close every upstream client and drop its pooled connections (called on shutdown)
+    """
+    for task in _health_checks:
+        task.cancel()
+    _health_checks.clear()
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
+    _balancers.clear()
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """
+    Return the shared client for an upstream
+    """
+    return _clients[name]
+
+
+def instances_snapshot() -> dict:
+    """
+    Load and health state of every upstream instance
+    """
+    return {name: balancer.snapshot() for name, balancer in _balancers.items()}
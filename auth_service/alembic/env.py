@@ -11,6 +11,8 @@ from alembic import context
 # Import your SQLAlchemy Base and models
 from app.core.database import Base  # your Base
 from app.models.user import User    # your User model
+from app.models.revoked_token import RevokedToken  # revoked token feed
+from app.models.revoked_user import RevokedUser  # revoked user feed
 
 # this is the Alembic Config object, which provides access to the values within the .ini file
 config = context.config
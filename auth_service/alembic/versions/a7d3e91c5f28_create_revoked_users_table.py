@@ -0,0 +1,39 @@
+"""create revoked users table
+
+Revision ID: a7d3e91c5f28
+Revises: 5b1f0c2e9d47
+Create Date: 2026-10-18 16:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e91c5f28'
+down_revision: Union[str, Sequence[str], None] = '5b1f0c2e9d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('revoked_users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    # Users deactivated before the feed existed
+    op.execute(
+        "INSERT INTO revoked_users (user_id, revoked_at) "
+        "SELECT id, CURRENT_TIMESTAMP FROM users WHERE is_active = 0 ORDER BY id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('revoked_users')
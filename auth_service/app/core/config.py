@@ -1,11 +1,74 @@
+import os
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
     SECRET_KEY: str
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"  # RS256 / EdDSA sign with rotating keys published as JWKS
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # Asymmetric signing keys (only used when ALGORITHM is RS256 / EdDSA)
+    JWT_KEYS_DIR: str = "./keys"
+    # How long a retired key stays published after rotation; must exceed the token lifetime
+    JWT_KEY_OVERLAP_SECONDS: int = 2 * 60 * 60
+    JWKS_MAX_AGE: int = 300
+    # Unknown kids re-check JWT_KEYS_DIR for rotated keys at most this often
+    JWT_KEY_RELOAD_MIN_SECONDS: float = 10.0
+
+    # Rows hashed and inserted per transaction by python -m app.services.user_import
+    USER_IMPORT_BATCH_SIZE: int = 500
+
+    # Upper bound on tokens per POST /auth/validate-tokens
+    MAX_BULK_TOKENS: int = 1000
+
+    # user id -> (email, is_active) cache used by token validation; TTL 0 disables
+    USER_CACHE_MAX_ENTRIES: int = 100000
+    USER_CACHE_TTL: float = 300.0
+
+    # Token revocation feed (Bloom filter snapshot + deltas)
+    REVOCATION_BLOOM_CAPACITY: int = 1_000_000
+    REVOCATION_BLOOM_FP_RATE: float = 0.001
+    REVOCATION_SYNC_SECONDS: float = 5.0  # pick up revocations made by other instances
+    REVOCATION_REBUILD_SECONDS: float = 3600.0  # prune expired entries
+    REVOCATION_MAX_DELTAS: int = 10000  # beyond this consumers must re-download the snapshot
+
+    # Database connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = False
+
+    # Password hashing policy; stored hashes with other settings are rehashed on login.
+    # Tune with: python -m app.core.password_policy calibrate
+    PASSWORD_HASH_SCHEME: str = "bcrypt"  # or "argon2" (argon2id, needs argon2-cffi)
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 1
+
+    # Failed login throttling (exponential backoff per email and per client IP)
+    LOGIN_THROTTLE_BACKEND: str = "memory"  # "redis" shares counters between instances
+    LOGIN_THROTTLE_REDIS_URL: str = "redis://localhost:6379/0"
+    LOGIN_THROTTLE_MAX_ENTRIES: int = 100000
+    LOGIN_THROTTLE_EMAIL_FREE_ATTEMPTS: int = 5
+    LOGIN_THROTTLE_IP_FREE_ATTEMPTS: int = 20
+    LOGIN_THROTTLE_BASE_DELAY: float = 1.0
+    LOGIN_THROTTLE_MAX_DELAY: float = 900.0
+    LOGIN_THROTTLE_RESET_SECONDS: float = 900.0
+    # Take the client IP from X-Forwarded-For (only behind trusted proxies). Entries
+    # are read from the right, past the LOGIN_THROTTLE_TRUSTED_PROXY_HOPS - 1 addresses
+    # appended by inner proxies; anything further left is client-controlled.
+    LOGIN_THROTTLE_TRUST_FORWARDED_FOR: bool = False
+    LOGIN_THROTTLE_TRUSTED_PROXY_HOPS: int = 1
+
+    # Password hashing pool: "process" (avoids the GIL) or "thread"
+    PASSWORD_HASH_EXECUTOR: str = "process"
+    PASSWORD_HASH_WORKERS: int = os.cpu_count() or 1
+    # Hash/verify calls queued or running before new ones get 503
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
     class Config:
         env_file = ".env"
 
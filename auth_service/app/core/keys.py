@@ -0,0 +1,174 @@
+"""
+Asymmetric signing keys (RS256 / EdDSA) with `kid`s and rotation.
+
+Keys are PEM files in JWT_KEYS_DIR named `<kid>.pem`; kids are UTC timestamps,
+so the newest key signs and older ones stay published in the JWKS (for
+verification only) until every token they signed has expired.
+
+Rotate from the auth_service directory with:
+
+    python -m app.core.keys rotate
+"""
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import jwt
+
+from app.core.config import settings
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "EdDSA"}
+
+
+def is_asymmetric(algorithm: str) -> bool:
+    return algorithm in ASYMMETRIC_ALGORITHMS
+
+
+@dataclass
+class SigningKey:
+    kid: str
+    private_key: object
+    created_at: float
+
+    def public_jwk(self, algorithm: str) -> dict:
+        public_key = self.private_key.public_key()
+        if algorithm == "EdDSA":
+            jwk = jwt.algorithms.OKPAlgorithm.to_jwk(public_key, as_dict=True)
+        else:
+            jwk = jwt.algorithms.RSAAlgorithm.to_jwk(public_key, as_dict=True)
+        jwk.update({"kid": self.kid, "alg": algorithm, "use": "sig"})
+        return jwk
+
+
+class KeyStore:
+    def __init__(self, directory: str, algorithm: str):
+        self.directory = directory
+        self.algorithm = algorithm
+        self._keys: dict[str, SigningKey] = {}
+        self._directory_mtime: int | None = None
+        self._last_reload_check = float("-inf")
+
+    # ---------------- LOADING ----------------
+    def load(self):
+        """
+        (Re)read the key directory; create the first key if there is none.
+        Keys already in memory are reused, only new PEM files are parsed.
+        """
+        from cryptography.hazmat.primitives import serialization
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._directory_mtime = os.stat(self.directory).st_mtime_ns
+        keys = {}
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pem"):
+                continue
+            kid = name[:-len(".pem")]
+            if kid in self._keys:
+                keys[kid] = self._keys[kid]
+                continue
+            path = os.path.join(self.directory, name)
+            with open(path, "rb") as f:
+                private_key = serialization.load_pem_private_key(f.read(), password=None)
+            keys[kid] = SigningKey(kid, private_key, os.path.getmtime(path))
+        self._keys = keys
+
+        if not self._keys:
+            self.rotate()
+
+    def _generate(self):
+        if self.algorithm == "EdDSA":
+            from cryptography.hazmat.primitives.asymmetric import ed25519
+            return ed25519.Ed25519PrivateKey.generate()
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    # ---------------- ROTATION ----------------
+    def rotate(self) -> SigningKey:
+        """
+        Create a new active key and prune keys retired longer than the overlap window
+        """
+        from cryptography.hazmat.primitives import serialization
+
+        private_key = self._generate()
+        kid = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S%f")
+        path = os.path.join(self.directory, f"{kid}.pem")
+        with open(path, "wb") as f:
+            f.write(private_key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            ))
+        os.chmod(path, 0o600)
+
+        key = SigningKey(kid, private_key, time.time())
+        self._keys[kid] = key
+        self.prune()
+        self._directory_mtime = os.stat(self.directory).st_mtime_ns
+        return key
+
+    def prune(self):
+        """
+        Delete keys whose successor has been active longer than the overlap window,
+        i.e. no unexpired token can still be signed by them. A running instance
+        only switches to a key rotated by another process (e.g. the CLI) on its
+        next reload, up to JWT_KEY_RELOAD_MIN_SECONDS later, so that is added on.
+        """
+        overlap = settings.JWT_KEY_OVERLAP_SECONDS + settings.JWT_KEY_RELOAD_MIN_SECONDS
+        ordered = sorted(self._keys.values(), key=lambda k: k.kid)
+        for key, successor in zip(ordered, ordered[1:]):
+            if time.time() - successor.created_at > overlap:
+                os.remove(os.path.join(self.directory, f"{key.kid}.pem"))
+                del self._keys[key.kid]
+
+    # ---------------- ACCESS ----------------
+    @property
+    def active(self) -> SigningKey:
+        if not self._keys:
+            self.load()
+        else:
+            self._reload_if_changed()  # Start signing with a key rotated elsewhere
+        return self._keys[max(self._keys)]
+
+    def _reload_if_changed(self):
+        """
+        Pick up keys rotated (or pruned) by another process. Called from the
+        request path (signing, JWKS, unknown kids), so it stats the directory at
+        most once per JWT_KEY_RELOAD_MIN_SECONDS and only re-reads it when its
+        mtime changed; forged kids can't make every request hit the disk.
+        """
+        now = time.monotonic()
+        if now - self._last_reload_check < settings.JWT_KEY_RELOAD_MIN_SECONDS:
+            return
+        self._last_reload_check = now
+        try:
+            if os.stat(self.directory).st_mtime_ns == self._directory_mtime:
+                return
+        except FileNotFoundError:
+            return
+        self.load()
+
+    def public_key(self, kid: str):
+        if kid not in self._keys:
+            self._reload_if_changed()
+        key = self._keys.get(kid)
+        return key.private_key.public_key() if key else None
+
+    def jwks(self) -> dict:
+        if not self._keys:
+            self.load()
+        else:
+            self._reload_if_changed()
+        return {"keys": [key.public_jwk(self.algorithm) for key in self._keys.values()]}
+
+
+key_store = KeyStore(settings.JWT_KEYS_DIR, settings.ALGORITHM)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["rotate"]:
+        print("usage: python -m app.core.keys rotate")
+        sys.exit(1)
+    key_store.load()
+    print(f"Active signing key: {key_store.rotate().kid}")
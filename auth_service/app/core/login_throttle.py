@@ -0,0 +1,152 @@
+import json
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+class FailureState(NamedTuple):
+    failures: int
+    blocked_until: float  # wall clock, so state can be shared between instances
+    expires_at: float
+
+
+# ---------------- BACKENDS ----------------
+class MemoryThrottleBackend:
+    """
+    Bounded LRU of key -> FailureState; expired entries are dropped on access
+    and the least recently used ones are evicted past `max_entries`.
+    State is per process: use the redis backend when running several instances.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, FailureState]" = OrderedDict()
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[FailureState]:
+        state = self._entries.get(key)
+        if state is None:
+            return None
+        if state.expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return state
+
+    async def set(self, key: str, state: FailureState):
+        self._entries[key] = state
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "max_entries": self.max_entries, "evictions": self.evictions}
+
+
+class RedisThrottleBackend:
+    """
+    Shares failure counters between auth_service instances; redis expiry bounds memory.
+    Requires the redis package.
+    """
+
+    def __init__(self, url: str, prefix: str = "login-throttle:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[FailureState]:
+        raw = await self._redis.get(self.prefix + key)
+        return FailureState(*json.loads(raw)) if raw else None
+
+    async def set(self, key: str, state: FailureState):
+        ttl = max(1, int(state.expires_at - time.time()) + 1)
+        await self._redis.set(self.prefix + key, json.dumps(state), ex=ttl)
+
+    async def delete(self, key: str):
+        await self._redis.delete(self.prefix + key)
+
+    def stats(self) -> dict:
+        return {"backend": "redis"}
+
+
+# ---------------- THROTTLE ----------------
+class LoginThrottle:
+    """
+    Per-email and per-IP failed login counters with exponential backoff.
+    After `free_attempts` failures a key is blocked for base_delay * 2**n seconds
+    (capped at max_delay); blocked attempts are rejected before any password
+    hashing. Counters reset after `reset_seconds` without failures, and the email
+    counter also resets on a successful login.
+    """
+
+    def __init__(self, backend, email_free_attempts: int, ip_free_attempts: int,
+                 base_delay: float, max_delay: float, reset_seconds: float):
+        self.backend = backend
+        self.email_free_attempts = email_free_attempts
+        self.ip_free_attempts = ip_free_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.reset_seconds = reset_seconds
+        self.rejected = 0
+
+    def _keys(self, email: str, client_ip: Optional[str]) -> list[tuple[str, int]]:
+        keys = [(f"email:{email.strip().lower()}", self.email_free_attempts)]
+        if client_ip:
+            keys.append((f"ip:{client_ip}", self.ip_free_attempts))
+        return keys
+
+    async def check(self, email: str, client_ip: Optional[str]):
+        now = time.time()
+        for key, _ in self._keys(email, client_ip):
+            state = await self.backend.get(key)
+            if state is not None and state.blocked_until > now:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many failed login attempts, try again later",
+                    headers={"Retry-After": str(int(state.blocked_until - now) + 1)},
+                )
+
+    async def record_failure(self, email: str, client_ip: Optional[str]):
+        now = time.time()
+        for key, free_attempts in self._keys(email, client_ip):
+            state = await self.backend.get(key)
+            failures = (state.failures if state else 0) + 1
+            blocked_until = 0.0
+            if failures >= free_attempts:
+                delay = min(self.base_delay * 2 ** (failures - free_attempts), self.max_delay)
+                blocked_until = now + delay
+            expires_at = max(blocked_until, now + self.reset_seconds)
+            await self.backend.set(key, FailureState(failures, blocked_until, expires_at))
+
+    async def record_success(self, email: str):
+        # Only the email counter: logging into one's own account must not clear an IP's record
+        await self.backend.delete(self._keys(email, None)[0][0])
+
+    def stats(self) -> dict:
+        return {"rejected": self.rejected, **self.backend.stats()}
+
+
+def _build_backend():
+    if settings.LOGIN_THROTTLE_BACKEND == "redis":
+        return RedisThrottleBackend(settings.LOGIN_THROTTLE_REDIS_URL)
+    return MemoryThrottleBackend(settings.LOGIN_THROTTLE_MAX_ENTRIES)
+
+
+login_throttle = LoginThrottle(
+    backend=_build_backend(),
+    email_free_attempts=settings.LOGIN_THROTTLE_EMAIL_FREE_ATTEMPTS,
+    ip_free_attempts=settings.LOGIN_THROTTLE_IP_FREE_ATTEMPTS,
+    base_delay=settings.LOGIN_THROTTLE_BASE_DELAY,
+    max_delay=settings.LOGIN_THROTTLE_MAX_DELAY,
+    reset_seconds=settings.LOGIN_THROTTLE_RESET_SECONDS,
+)
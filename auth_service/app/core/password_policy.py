@@ -0,0 +1,126 @@
+"""
+Password hashing policy (bcrypt rounds / argon2id parameters) and tools to tune it.
+
+From the auth_service directory:
+
+    python -m app.core.password_policy calibrate --target-ms 250
+    python -m app.core.password_policy benchmark --seconds 5
+
+argon2 needs the optional argon2-cffi package.
+"""
+import argparse
+import os
+import time
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+SCHEMES = ("bcrypt", "argon2")
+
+
+def build_crypt_context(
+    scheme: str | None = None,
+    bcrypt_rounds: int | None = None,
+    argon2_time_cost: int | None = None,
+    argon2_memory_cost: int | None = None,
+    argon2_parallelism: int | None = None,
+) -> CryptContext:
+    """
+    CryptContext for the configured policy. Hashes made with another scheme or
+    other parameters still verify but report `needs_update`, so they are
+    rehashed on the next successful login.
+    """
+    scheme = scheme or settings.PASSWORD_HASH_SCHEME
+    if scheme not in SCHEMES:
+        raise ValueError(f"PASSWORD_HASH_SCHEME must be one of {SCHEMES}")
+    rounds = bcrypt_rounds or settings.BCRYPT_ROUNDS
+    time_cost = argon2_time_cost or settings.ARGON2_TIME_COST
+    memory_cost = argon2_memory_cost or settings.ARGON2_MEMORY_COST
+    parallelism = argon2_parallelism or settings.ARGON2_PARALLELISM
+
+    return CryptContext(
+        schemes=[scheme] + [s for s in SCHEMES if s != scheme],
+        deprecated="auto",  # Every scheme except the first
+        # min == max == default: any other cost counts as outdated
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+        argon2__type="ID",
+        argon2__rounds=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
+
+
+def _hash_time(context: CryptContext, samples: int = 3) -> float:
+    started = time.perf_counter()
+    for _ in range(samples):
+        context.hash("calibration-password")
+    return (time.perf_counter() - started) / samples
+
+
+# ---------------- CALIBRATION ----------------
+def calibrate(target_seconds: float, scheme: str) -> dict:
+    """
+    Largest cost whose hash time on this host stays within `target_seconds`
+    """
+    if scheme == "bcrypt":
+        best = 4
+        for rounds in range(4, 32):
+            elapsed = _hash_time(build_crypt_context("bcrypt", bcrypt_rounds=rounds))
+            if elapsed > target_seconds:
+                break
+            best = rounds
+        return {"PASSWORD_HASH_SCHEME": "bcrypt", "BCRYPT_ROUNDS": best}
+
+    best = 1
+    for time_cost in range(1, 65):
+        elapsed = _hash_time(build_crypt_context("argon2", argon2_time_cost=time_cost))
+        if elapsed > target_seconds:
+            break
+        best = time_cost
+    return {
+        "PASSWORD_HASH_SCHEME": "argon2",
+        "ARGON2_TIME_COST": best,
+        "ARGON2_MEMORY_COST": settings.ARGON2_MEMORY_COST,
+        "ARGON2_PARALLELISM": settings.ARGON2_PARALLELISM,
+    }
+
+
+# ---------------- BENCHMARK ----------------
+def benchmark(seconds: float) -> dict:
+    """
+    Hashes per second on one core with the current policy
+    """
+    context = build_crypt_context()
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        context.hash("benchmark-password")
+        count += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "scheme": settings.PASSWORD_HASH_SCHEME,
+        "hashes_per_second_per_core": round(count / elapsed, 2),
+        "ms_per_hash": round(elapsed / count * 1000, 1),
+        "cores": os.cpu_count(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    calibrate_parser = commands.add_parser("calibrate", help="pick parameters for a target hash time")
+    calibrate_parser.add_argument("--target-ms", type=float, default=250.0)
+    calibrate_parser.add_argument("--scheme", choices=SCHEMES, default=settings.PASSWORD_HASH_SCHEME)
+    benchmark_parser = commands.add_parser("benchmark", help="hashes per second per core")
+    benchmark_parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    if args.command == "calibrate":
+        for name, value in calibrate(args.target_ms / 1000, args.scheme).items():
+            print(f"{name}={value}")
+    else:
+        for name, value in benchmark(args.seconds).items():
+            print(f"{name}: {value}")
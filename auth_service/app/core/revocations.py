@@ -0,0 +1,98 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+# The Bloom filter format is shared with the verifying services via common/ at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from common.bloom import BloomFilter  # noqa: E402
+from app.models.revoked_token import RevokedToken
+
+
+def utcnow() -> datetime:
+    # Naive UTC, matching how token `exp` values are stored
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class RevocationIndex:
+    """
+    In-memory Bloom filter of revoked, unexpired token `jti`s plus the feed version
+    (highest revoked_tokens.id it contains). A miss means "not revoked" without a
+    DB read; a hit is confirmed against the DB. The same filter is published as
+    the snapshot that other services download.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.bloom = BloomFilter.for_capacity(capacity, fp_rate)
+        self.version = 0
+        self.count = 0
+        self._snapshot: dict | None = None
+
+    def add(self, jti: str, version: int):
+        self.bloom.add(jti)
+        self.count += 1
+        self.version = max(self.version, version)
+        self._snapshot = None
+
+    def might_be_revoked(self, jti: str) -> bool:
+        return self.count > 0 and jti in self.bloom
+
+    async def sync(self, db: AsyncSession):
+        """
+        Pull revocations written since `version` (e.g. by other auth instances)
+        """
+        await self._add_since(db, self.version)
+
+    async def _add_since(self, db: AsyncSession, version: int):
+        result = await db.execute(
+            select(RevokedToken.id, RevokedToken.jti)
+            .where(RevokedToken.id > version)
+            .order_by(RevokedToken.id)
+        )
+        for row in result:
+            self.add(row.jti, row.id)
+
+    async def rebuild(self, db: AsyncSession):
+        """
+        Drop expired revocations (their tokens are rejected anyway) and rebuild
+        the filter from what is left, so it doesn't fill up over time
+        """
+        # Revocations after this version may land in the old filter while we
+        # await below; they are re-applied to the new one once it's swapped in
+        since = self.version
+        await db.execute(delete(RevokedToken).where(RevokedToken.expires_at < utcnow()))
+        await db.commit()
+
+        bloom = BloomFilter.for_capacity(self.capacity, self.fp_rate)
+        count = 0
+        result = await db.execute(select(RevokedToken.jti).where(RevokedToken.id <= since))
+        for (jti,) in result:
+            bloom.add(jti)
+            count += 1
+
+        self.bloom = bloom
+        self.count = count
+        self._snapshot = None
+        await self._add_since(db, since)
+
+    def snapshot(self) -> dict:
+        if self._snapshot is None:
+            self._snapshot = {
+                "version": self.version,
+                "count": self.count,
+                "bloom": self.bloom.to_dict(),
+            }
+        return self._snapshot
+
+
+revocation_index = RevocationIndex(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    fp_rate=settings.REVOCATION_BLOOM_FP_RATE,
+)
@@ -1,11 +1,15 @@
-from passlib.context import CryptContext
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+import asyncio
+import uuid
 import jwt
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.keys import is_asymmetric, key_store
+from app.core.password_policy import build_crypt_context
 
-# password hashing config
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# password hashing config (see app/core/password_policy.py)
+pwd_context = build_crypt_context()
 
 
 # ---------------- PASSWORD ----------------
@@ -18,13 +22,87 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify, and return a new hash when the stored one doesn't match the current policy
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+# ---------------- PASSWORD HASHING EXECUTOR ----------------
+# bcrypt is CPU heavy (hundreds of ms); run it off the event loop in a bounded
+# pool so a login spike can't stall /auth/validate-token.
+
+_hash_executor: Executor | None = None
+_pending_hashes = 0
+
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "thread":
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+        else:
+            _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return _hash_executor
+
+
+async def _run_hashing(fn, *args):
+    global _pending_hashes
+    if _pending_hashes >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many password operations in progress, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending_hashes += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), fn, *args)
+    finally:
+        _pending_hashes -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await _run_hashing(verify_and_update_password, plain_password, hashed_password)
+
+
+def shutdown_hash_executor():
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
 # ---------------- TOKEN CREATION ----------------
 
 def create_access_token(payload: dict) -> str:
     to_encode = payload.copy()
 
     expire = datetime.now() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # jti identifies the token so it can be revoked individually
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
+
+    if is_asymmetric(settings.ALGORITHM):
+        signing_key = key_store.active
+        return jwt.encode(
+            to_encode,
+            signing_key.private_key,
+            algorithm=settings.ALGORITHM,
+            headers={"kid": signing_key.kid},
+        )
 
     token = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return token
@@ -32,9 +110,20 @@ def create_access_token(payload: dict) -> str:
 
 # ---------------- TOKEN VALIDATION ----------------
 
+def _verification_key(token: str):
+    if not is_asymmetric(settings.ALGORITHM):
+        return settings.SECRET_KEY
+
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = key_store.public_key(kid) if kid else None
+    if key is None:
+        raise jwt.InvalidTokenError("Unknown signing key")
+    return key
+
+
 def decode_access_token(token: str) -> dict:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _verification_key(token), algorithms=[settings.ALGORITHM])
         return payload
 
     except jwt.ExpiredSignatureError:
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+    # AUTOINCREMENT: ids are the revocation feed version and must never be reused
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True)
+    jti = Column(String(64), unique=True, nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # UTC, from the token's exp
+    revoked_at = Column(DateTime, default=datetime.now)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+
+class RevokedUser(Base):
+    """
+    One row per deactivation; ids are the user revocation feed version, so
+    consumers fetch only the users deactivated since their last poll
+    """
+    __tablename__ = "revoked_users"
+    # AUTOINCREMENT: ids are the feed version and must never be reused
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    revoked_at = Column(DateTime, default=datetime.now)
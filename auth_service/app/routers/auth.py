@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.database import get_db
 from app.services.auth_service import AuthService
 from app.core.config import settings 
+from app.core.user_cache import user_status_cache
+from app.core.revocations import revocation_index
+from app.core.login_throttle import login_throttle
+from app.schemas.token import TokenBatch, TokenValidationResult
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 bearer_scheme = HTTPBearer()
@@ -12,18 +16,31 @@ bearer_scheme = HTTPBearer()
 
 # ---------------- REGISTER ----------------
 @router.post("/register")
-async def register(email: str, password: str, db: Session = Depends(get_db)):
+async def register(email: str, password: str, db: AsyncSession = Depends(get_db)):
     print("Using database:", settings.DATABASE_URL)  #
     service = AuthService(db)
-    user = service.register_user(email, password)
+    user = await service.register_user(email, password)
     return {"message": "User registered successfully", "user_id": user.id}
 
 
 # ---------------- LOGIN ----------------
+def _client_ip(request: Request):
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if settings.LOGIN_THROTTLE_TRUST_FORWARDED_FOR and forwarded_for:
+        # The left-most entries are whatever the client sent; the address our
+        # outermost trusted proxy saw is LOGIN_THROTTLE_TRUSTED_PROXY_HOPS from the right.
+        # A shorter chain didn't pass every trusted proxy, so none of it is trusted.
+        addresses = [address.strip() for address in forwarded_for.split(",") if address.strip()]
+        hops = max(settings.LOGIN_THROTTLE_TRUSTED_PROXY_HOPS, 1)
+        if len(addresses) >= hops:
+            return addresses[-hops]
+    return request.client.host if request.client else None
+
+
 @router.post("/login")
-async def login(email: str, password: str, db: Session = Depends(get_db)):
+async def login(request: Request, email: str, password: str, db: AsyncSession = Depends(get_db)):
     service = AuthService(db)
-    token = service.login_user(email, password)
+    token = await service.login_user(email, password, _client_ip(request))
     return {"access_token": token, "token_type": "bearer"}
 
 
@@ -31,11 +48,81 @@ async def login(email: str, password: str, db: Session = Depends(get_db)):
 @router.post("/validate-token")
 async def validate_token(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     token = credentials.credentials
 
     service = AuthService(db)
-    user_data = service.validate_token(token)
+    user_data = await service.validate_token(token)
 
     return user_data
+
+
+# ---------------- VALIDATE MANY TOKENS ----------------
+@router.post("/validate-tokens", response_model=list[TokenValidationResult])
+async def validate_tokens(batch: TokenBatch, db: AsyncSession = Depends(get_db)):
+    if len(batch.tokens) > settings.MAX_BULK_TOKENS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_BULK_TOKENS} tokens per request"
+        )
+
+    service = AuthService(db)
+    return await service.validate_tokens(batch.tokens)
+
+
+# ---------------- LOGOUT (REVOKE THIS TOKEN) ----------------
+@router.post("/logout")
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    service = AuthService(db)
+    await service.revoke_token(credentials.credentials)
+    return {"message": "Token revoked"}
+
+
+# ---------------- REVOCATIONS (polled by services verifying tokens locally) ----------------
+@router.get("/revocations")
+async def revocations(since: int = 0, users_since: int = 0, db: AsyncSession = Depends(get_db)):
+    """
+    Revoked token jtis added after version `since`, and users deactivated after
+    user version `users_since`.
+    If `snapshot_required` is true, download /auth/revocations/snapshot instead.
+    """
+    service = AuthService(db)
+    return await service.revocations_since(since, users_since)
+
+
+@router.get("/revocations/snapshot")
+async def revocations_snapshot(db: AsyncSession = Depends(get_db)):
+    """
+    Bloom filter of every revoked, unexpired jti up to `version`, and every
+    deactivated user up to `user_version`
+    """
+    service = AuthService(db)
+    await revocation_index.sync(db)
+    snapshot = dict(revocation_index.snapshot())
+    snapshot["user_version"], snapshot["revoked_user_ids"] = await service.list_revoked_user_ids()
+    return snapshot
+
+
+# ---------------- DEACTIVATE OWN ACCOUNT ----------------
+@router.post("/deactivate")
+async def deactivate(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    service = AuthService(db)
+    user_data = await service.validate_token(credentials.credentials)
+    await service.deactivate_user(user_data["user_id"])
+    return {"message": "User deactivated", "user_id": user_data["user_id"]}
+
+
+# ---------------- METRICS ----------------
+@router.get("/metrics")
+async def metrics():
+    return {
+        "user_status_cache": user_status_cache.stats(),
+        "login_throttle": login_throttle.stats(),
+    }
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, Response, status
+
+from app.core.config import settings
+from app.core.keys import is_asymmetric, key_store
+
+router = APIRouter(tags=["Auth"])
+
+
+# ---------------- JWKS (public keys for local token verification) ----------------
+@router.get("/.well-known/jwks.json")
+async def jwks(response: Response):
+    if not is_asymmetric(settings.ALGORITHM):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tokens are signed with a shared secret; no public keys"
+        )
+
+    response.headers["Cache-Control"] = f"public, max-age={settings.JWKS_MAX_AGE}"
+    return key_store.jwks()
@@ -0,0 +1,14 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class TokenBatch(BaseModel):
+    tokens: List[str]
+
+
+class TokenValidationResult(BaseModel):
+    valid: bool
+    user_id: Optional[int] = None
+    email: Optional[str] = None
+    detail: Optional[str] = None
@@ -1,68 +1,283 @@
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from app.models.user import User
-from app.core.security import hash_password, verify_password, create_access_token, decode_access_token
+from app.models.revoked_token import RevokedToken
+from app.models.revoked_user import RevokedUser
+from app.core.revocations import revocation_index
+from app.core.user_cache import UserStatus, user_status_cache
+from app.core.login_throttle import login_throttle
+from app.core.config import settings
+from app.core.security import hash_password_async, verify_and_update_password_async, create_access_token, decode_access_token
 
 
 class AuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     # ---------------- REGISTER ----------------
-    def register_user(self, email: str, password: str) -> User:
+    async def register_user(self, email: str, password: str) -> User:
         user = User(
             email=email,
-            password_hash=hash_password(password),
+            password_hash=await hash_password_async(password),
             is_active=True
         )
 
         try:
             self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
+            await self.db.commit()
+            await self.db.refresh(user)
             return user
 
         except IntegrityError:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already registered"
             )
 
     # ---------------- LOGIN ----------------
-    def login_user(self, email: str, password: str) -> str:
-        user = self.db.query(User).filter(User.email == email).first()
+    async def login_user(self, email: str, password: str, client_ip: Optional[str] = None) -> str:
+        # Reject throttled attempts before spending a password hash on them
+        await login_throttle.check(email, client_ip)
+
+        result = await self.db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
+
+        if not user:
+            await login_throttle.record_failure(email, client_ip)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid email or password"
+            )
 
-        if not user or not verify_password(password, user.password_hash):
+        valid, new_hash = await verify_and_update_password_async(password, user.password_hash)
+        if not valid:
+            await login_throttle.record_failure(email, client_ip)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
 
-        token = create_access_token({"sub": str(user.id)})
+        await login_throttle.record_success(email)
+
+        if new_hash:
+            # Stored hash predates the current hashing policy; upgrade it transparently
+            user.password_hash = new_hash
+            await self.db.commit()
+
+        token = create_access_token({"sub": str(user.id), "email": user.email})
         return token
 
     # ---------------- VALIDATE TOKEN (MOST IMPORTANT) ----------------
-    def validate_token(self, token: str) -> dict:
+    async def validate_token(self, token: str) -> dict:
+        user_id, jti = self._token_claims(token)
+        if jti and await self._revoked_jtis({jti}):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token revoked"
+            )
+        user_status = await self._get_user_status(user_id)
+        return self._user_data(user_id, user_status)
+
+    # ---------------- VALIDATE MANY TOKENS ----------------
+    async def validate_tokens(self, tokens: list[str]) -> list[dict]:
+        """
+        Validate tokens in order; all distinct users are resolved with one IN query.
+        Each result is {"valid": True, "user_id", "email"} or {"valid": False, "detail"}.
+        """
+        claims: list[tuple[int, str | None] | HTTPException] = []
+        for token in tokens:
+            try:
+                claims.append(self._token_claims(token))
+            except HTTPException as e:
+                claims.append(e)
+
+        decoded = [c for c in claims if not isinstance(c, HTTPException)]
+        revoked = await self._revoked_jtis({jti for _, jti in decoded if jti})
+        statuses = await self._get_user_statuses({user_id for user_id, _ in decoded})
+
+        results = []
+        for claim in claims:
+            try:
+                if isinstance(claim, HTTPException):
+                    raise claim
+                user_id, jti = claim
+                if jti in revoked:
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="Token revoked"
+                    )
+                results.append({"valid": True, **self._user_data(user_id, statuses.get(user_id))})
+            except HTTPException as e:
+                results.append({"valid": False, "detail": e.detail})
+        return results
+
+    def _token_claims(self, token: str) -> tuple[int, str | None]:
+        """
+        (user id, jti) of a token with a valid signature and expiry
+        """
         payload = decode_access_token(token)
         user_id = payload.get("sub")
 
-        if not user_id:
+        try:
+            return int(user_id), payload.get("jti")
+        except (TypeError, ValueError):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token payload"
             )
 
-        user = self.db.query(User).filter(User.id == int(user_id)).first()
-
-        if not user:
+    def _user_data(self, user_id: int, user_status: UserStatus | None) -> dict:
+        if not user_status:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found"
             )
 
+        if not user_status.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User inactive"
+            )
+
+        return {
+            "user_id": user_id,
+            "email": user_status.email
+        }
+
+    async def _get_user_status(self, user_id: int) -> UserStatus | None:
+        # No cache pre-check here: _get_user_statuses looks the id up once, so
+        # each validation counts as exactly one hit or one miss
+        statuses = await self._get_user_statuses({user_id})
+        return statuses.get(user_id)
+
+    async def _get_user_statuses(self, user_ids: set[int]) -> dict[int, UserStatus]:
+        statuses = {}
+        missing = []
+        for user_id in user_ids:
+            cached = user_status_cache.get(user_id)
+            if cached:
+                statuses[user_id] = cached
+            else:
+                missing.append(user_id)
+
+        if missing:
+            result = await self.db.execute(
+                select(User.id, User.email, User.is_active).where(User.id.in_(missing))
+            )
+            for row in result:
+                # is_active is nullable; treat NULL like the column default (active)
+                user_status = UserStatus(row.email, row.is_active is not False)
+                user_status_cache.set(row.id, *user_status)
+                statuses[row.id] = user_status
+        return statuses
+
+    # ---------------- DEACTIVATE ----------------
+    async def deactivate_user(self, user_id: int):
+        await self.db.execute(update(User).where(User.id == user_id).values(is_active=False))
+        self.db.add(RevokedUser(user_id=user_id))
+        await self.db.commit()
+        user_status_cache.invalidate(user_id)
+
+    async def invalidate_deactivated_users(self, version: int) -> int:
+        """
+        Drop cached statuses of users deactivated after `version`, on this or any
+        other instance; returns the newest version seen
+        """
+        result = await self.db.execute(
+            select(RevokedUser.id, RevokedUser.user_id)
+            .where(RevokedUser.id > version)
+            .order_by(RevokedUser.id)
+        )
+        for row in result:
+            user_status_cache.invalidate(row.user_id)
+            version = row.id
+        return version
+
+    async def revoked_user_version(self) -> int:
+        return (await self.db.execute(select(func.max(RevokedUser.id)))).scalar() or 0
+
+    # ---------------- REVOCATIONS ----------------
+    async def list_revoked_user_ids(self) -> tuple[int, list[int]]:
+        """
+        Users whose tokens must be rejected by services verifying tokens locally,
+        with the user feed version the list is current as of
+        """
+        # Version first: a deactivation committed in between is sent again as a delta
+        version = await self.revoked_user_version()
+        result = await self.db.execute(select(User.id).where(User.is_active == False))  # noqa: E712
+        return version, list(result.scalars().all())
+
+    # ---------------- REVOKE SINGLE TOKENS (LOGOUT) ----------------
+    async def revoke_token(self, token: str):
+        payload = decode_access_token(token)
+        jti = payload.get("jti")
+        if not jti:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Token has no jti and cannot be revoked; it expires on its own"
+            )
+
+        revoked = RevokedToken(
+            jti=jti,
+            user_id=int(payload["sub"]),
+            expires_at=datetime.fromtimestamp(payload["exp"], timezone.utc).replace(tzinfo=None),
+        )
+        try:
+            self.db.add(revoked)
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()  # Already revoked
+            return
+        revocation_index.add(jti, revoked.id)
+
+    async def _revoked_jtis(self, jtis: set[str]) -> set[str]:
+        """
+        Which of these jtis are revoked: the Bloom filter rules most out without
+        touching the DB; possible hits are confirmed with one IN query
+        """
+        candidates = [jti for jti in jtis if revocation_index.might_be_revoked(jti)]
+        if not candidates:
+            return set()
+        result = await self.db.execute(select(RevokedToken.jti).where(RevokedToken.jti.in_(candidates)))
+        return set(result.scalars().all())
+
+    async def revocations_since(self, version: int, user_version: int) -> dict:
+        """
+        Revoked jtis added after `version` and users deactivated after
+        `user_version` (the consumer's last seen versions)
+        """
+        result = await self.db.execute(
+            select(RevokedToken.id, RevokedToken.jti)
+            .where(RevokedToken.id > version)
+            .order_by(RevokedToken.id)
+            .limit(settings.REVOCATION_MAX_DELTAS + 1)
+        )
+        rows = result.all()
+        result = await self.db.execute(
+            select(RevokedUser.id, RevokedUser.user_id)
+            .where(RevokedUser.id > user_version)
+            .order_by(RevokedUser.id)
+            .limit(settings.REVOCATION_MAX_DELTAS + 1)
+        )
+        user_rows = result.all()
+        if len(rows) > settings.REVOCATION_MAX_DELTAS or len(user_rows) > settings.REVOCATION_MAX_DELTAS:
+            return {
+                "version": revocation_index.version,
+                "user_version": user_version,
+                "snapshot_required": True,
+                "jtis": [],
+                "revoked_user_ids": [],
+            }
         return {
-            "user_id": user.id,
-            "email": user.email
+            "version": max([version, *(row.id for row in rows)]),
+            "user_version": max([user_version, *(row.id for row in user_rows)]),
+            "snapshot_required": False,
+            "jtis": [row.jti for row in rows],
+            "revoked_user_ids": [row.user_id for row in user_rows],
         }
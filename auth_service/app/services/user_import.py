@@ -0,0 +1,172 @@
+"""
+Bulk user import from NDJSON, one {"email": ..., "password": ...} object per line.
+
+From the auth_service directory:
+
+    python -m app.services.user_import users.ndjson > results.ndjson
+    cat users.ndjson | python -m app.services.user_import -
+
+Prints one result per input line: created (with user_id), duplicate or invalid.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.security import hash_password
+from app.models.user import User
+
+
+def _parse_line(number: int, line: str) -> dict:
+    row = {"line": number}
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return {**row, "status": "invalid", "error": "not valid JSON"}
+
+    email = record.get("email") if isinstance(record, dict) else None
+    password = record.get("password") if isinstance(record, dict) else None
+    if not isinstance(email, str) or not email.strip():
+        return {**row, "status": "invalid", "error": "email is required"}
+    if not isinstance(password, str) or not password:
+        return {**row, "status": "invalid", "error": "password is required"}
+    return {**row, "email": email.strip(), "password": password}
+
+
+def _batches(lines: Iterable[str], batch_size: int) -> Iterable[list[dict]]:
+    batch = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        batch.append(_parse_line(number, line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class UserImporter:
+    """
+    Streams rows in batches: duplicates (already stored, or repeated in the
+    input) are reported without being hashed, the rest are hashed across the
+    process pool and inserted in one transaction per batch. Hashing of the next
+    batch overlaps with the insert of the current one.
+    """
+
+    def __init__(self, db: AsyncSession, executor: Executor, batch_size: int):
+        self.db = db
+        self.executor = executor
+        self.batch_size = batch_size
+        self._seen_emails: set[str] = set()
+
+    async def run(self, lines: Iterable[str]) -> AsyncIterator[dict]:
+        pending: Optional[tuple[list[dict], asyncio.Future]] = None
+        for batch in _batches(lines, self.batch_size):
+            rows, results = await self._filter_duplicates(batch)
+            hashing = self._hash(rows)
+            if pending is not None:
+                for result in await self._insert(*pending):
+                    yield result
+            for result in results:
+                yield result
+            pending = (rows, hashing)
+
+        if pending is not None:
+            for result in await self._insert(*pending):
+                yield result
+
+    async def _filter_duplicates(self, batch: list[dict]) -> tuple[list[dict], list[dict]]:
+        """
+        Split a batch into rows to insert and results for rows that won't be
+        """
+        results = [row for row in batch if row.get("status") == "invalid"]
+        candidates = [row for row in batch if row.get("status") != "invalid"]
+
+        existing = set()
+        if candidates:
+            emails = {row["email"] for row in candidates}
+            result = await self.db.execute(select(User.email).where(User.email.in_(emails)))
+            existing = set(result.scalars().all())
+
+        rows = []
+        for row in candidates:
+            if row["email"] in existing or row["email"] in self._seen_emails:
+                results.append({"line": row["line"], "email": row["email"], "status": "duplicate"})
+                continue
+            self._seen_emails.add(row["email"])
+            rows.append(row)
+        return rows, results
+
+    def _hash(self, rows: list[dict]) -> asyncio.Future:
+        passwords = [row.pop("password") for row in rows]
+        chunksize = max(1, len(passwords) // (settings.PASSWORD_HASH_WORKERS * 4))
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(
+            None, lambda: list(self.executor.map(hash_password, passwords, chunksize=chunksize))
+        )
+
+    async def _insert(self, rows: list[dict], hashing: asyncio.Future) -> list[dict]:
+        hashes = await hashing
+        users = [User(email=row["email"], password_hash=h, is_active=True) for row, h in zip(rows, hashes)]
+        if not users:
+            return []
+
+        try:
+            self.db.add_all(users)
+            await self.db.commit()
+            return [
+                {"line": row["line"], "email": row["email"], "status": "created", "user_id": user.id}
+                for row, user in zip(rows, users)
+            ]
+        except IntegrityError:
+            # Someone registered one of these emails since the duplicate check;
+            # fall back to a savepoint per row so only the conflicting rows fail
+            await self.db.rollback()
+            return await self._insert_one_by_one(rows, hashes)
+
+    async def _insert_one_by_one(self, rows: list[dict], hashes: list[str]) -> list[dict]:
+        results = []
+        for row, password_hash in zip(rows, hashes):
+            user = User(email=row["email"], password_hash=password_hash, is_active=True)
+            try:
+                async with self.db.begin_nested():
+                    self.db.add(user)
+                results.append({"line": row["line"], "email": row["email"], "status": "created", "user_id": user.id})
+            except IntegrityError:
+                results.append({"line": row["line"], "email": row["email"], "status": "duplicate"})
+        await self.db.commit()
+        return results
+
+
+async def _main(path: str, batch_size: int, workers: int):
+    source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    counts: dict[str, int] = {}
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            async with SessionLocal() as db:
+                async for result in UserImporter(db, executor, batch_size).run(source):
+                    counts[result["status"]] = counts.get(result["status"], 0) + 1
+                    print(json.dumps(result))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        await engine.dispose()
+    print(json.dumps(counts), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="NDJSON file, or - for stdin")
+    parser.add_argument("--batch-size", type=int, default=settings.USER_IMPORT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    args = parser.parse_args()
+    asyncio.run(_main(args.path, args.batch_size, args.workers))
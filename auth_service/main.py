@@ -1,13 +1,65 @@
+import asyncio
+import logging
+
 from fastapi import FastAPI
-from app.core.database import Base, engine
-from app.routers import auth
+from app.core.database import Base, engine, SessionLocal
+from app.core.config import settings
+from app.core.keys import is_asymmetric, key_store
+from app.core.revocations import revocation_index
+from app.core.security import shutdown_hash_executor
+from app.services.auth_service import AuthService
+from app.routers import auth, jwks
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Auth Service")
 
 app.include_router(auth.router)
+app.include_router(jwks.router)
+
+
+@app.on_event("startup")
+async def startup():
+    # Create tables
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    if is_asymmetric(settings.ALGORITHM):
+        key_store.load()
+
+    async with SessionLocal() as db:
+        await revocation_index.rebuild(db)
+        user_version = await AuthService(db).revoked_user_version()
+    app.state.revocation_sync = asyncio.create_task(_sync_revocations(user_version))
+
+
+async def _sync_revocations(user_version: int):
+    """
+    Keep the revocation index in step with revocations made by other instances,
+    drop cached statuses of users they deactivated, and prune expired entries
+    now and then
+    """
+    loop = asyncio.get_running_loop()
+    last_rebuild = loop.time()
+    while True:
+        await asyncio.sleep(settings.REVOCATION_SYNC_SECONDS)
+        try:
+            async with SessionLocal() as db:
+                if loop.time() - last_rebuild >= settings.REVOCATION_REBUILD_SECONDS:
+                    await revocation_index.rebuild(db)
+                    last_rebuild = loop.time()
+                else:
+                    await revocation_index.sync(db)
+                user_version = await AuthService(db).invalidate_deactivated_users(user_version)
+        except Exception:
+            logger.exception("Failed to sync token revocations")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.revocation_sync.cancel()
+    shutdown_hash_executor()
+    await engine.dispose()
 
 
 @app.get("/")
@@ -0,0 +1,86 @@
+"""
+Check that every task listing query is served by an index.
+
+Builds the tasks table from task_service's alembic migrations in a scratch
+SQLite database, runs EXPLAIN QUERY PLAN for each GET /tasks variant
+(filters, sort order, cursor) and count query, and exits non-zero if any of
+them falls back to a full scan of `tasks`:
+
+    python benchmarks/task_query_plans.py
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+TASK_SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "task_service")
+
+
+def migrate(path: str):
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{path}")
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=TASK_SERVICE_DIR, env=env, check=True, capture_output=True,
+    )
+
+
+def listing_queries(service, cursor: str) -> dict:
+    variants = {
+        "first page": {},
+        "offset": {"offset": 100},
+        "desc": {"descending": True},
+        "status": {"status": "pending"},
+        "created range": {"created_after": datetime(2026, 1, 1), "created_before": datetime(2026, 2, 1)},
+        "status + range + desc": {"status": "completed", "created_after": datetime(2026, 1, 1), "descending": True},
+    }
+    queries = {}
+    for name, options in variants.items():
+        queries[name] = service.list_query(user_id=1, limit=11, **options)
+        if "offset" not in options:
+            queries[name + " (cursor)"] = service.list_query(user_id=1, limit=11, cursor=cursor, **options)
+    return queries
+
+
+def main() -> int:
+    sys.path.insert(0, TASK_SERVICE_DIR)
+    os.chdir(TASK_SERVICE_DIR)
+    from sqlalchemy import func, select
+    from sqlalchemy.dialects import sqlite
+    from models.task_profile import Task
+    from services.task_service import TaskService, encode_cursor
+
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "plans.db")
+        migrate(path)
+        conn = sqlite3.connect(path)
+        conn.executemany(
+            "INSERT INTO tasks (title, description, status, user_id) VALUES (?, ?, ?, ?)",
+            [(f"task {i}", "", ("pending", "in_progress", "completed")[i % 3], i % 50) for i in range(5000)],
+        )
+        conn.execute("ANALYZE")
+
+        service = TaskService(None)
+        cursor = encode_cursor(Task(id=42, created_at=datetime(2026, 1, 15)))
+        queries = listing_queries(service, cursor)
+        queries["counts"] = select(Task.status, func.count(Task.id)).where(Task.user_id == 1).group_by(Task.status)
+
+        failures = 0
+        for name, query in queries.items():
+            compiled = query.compile(dialect=sqlite.dialect())
+            params = [compiled.params[key] for key in compiled.positiontup]
+            params = [str(p) if isinstance(p, datetime) else p for p in params]
+            plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + str(compiled), params)]
+            full_scans = [step for step in plan if step.startswith("SCAN tasks")]
+            failures += bool(full_scans)
+            print(f"{'FULL SCAN' if full_scans else 'ok':9}  {name}")
+            for step in plan:
+                print(f"           {step}")
+        conn.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+GET /tasks/search latency (TaskService.search_tasks) over a large task table.
+
+Builds a scratch SQLite database through task_service's alembic migrations,
+loads --tasks synthetic tasks (Zipf-distributed vocabulary, so some words are
+very common and most are rare) spread over --users users, then reports
+p50/p99 per query shape:
+
+    python benchmarks/task_search.py --tasks 1000000
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+TASK_SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "task_service")
+VOCABULARY = [f"word{i}" for i in range(20000)]
+CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 10) for rank in range(len(VOCABULARY))))
+
+
+def load(path: str, tasks: int, users: int):
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{path}")
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=TASK_SERVICE_DIR, env=env, check=True, capture_output=True,
+    )
+    rnd = random.Random(7)
+    conn = sqlite3.connect(path)
+    started = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO tasks (title, description, status, user_id) VALUES (?, ?, 'pending', ?)",
+        (
+            (" ".join(rnd.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=4)), " ".join(rnd.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=12)), rnd.randrange(users))
+            for _ in range(tasks)
+        ),
+    )
+    conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('optimize')")
+    conn.commit()
+    conn.close()
+    print(f"loaded {tasks} tasks in {time.perf_counter() - started:.0f}s")
+
+
+async def measure(path: str, users: int, samples: int):
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    sys.path.insert(0, TASK_SERVICE_DIR)
+    from core.database import SessionLocal, engine
+    from services.task_service import TaskService
+
+    engine.echo = False
+    queries = {
+        "common word": "word0",
+        "mid-frequency word": "word200",
+        "rare word": "word15000",
+        "two words": "word5 word300",
+    }
+    rnd = random.Random(1)
+    print(f"{'query':20} {'p50 ms':>8} {'p99 ms':>8}")
+    async with SessionLocal() as db:
+        service = TaskService(db)
+        for name, text in queries.items():
+            timings = []
+            for _ in range(samples):
+                started = time.perf_counter()
+                await service.search_tasks(user_id=rnd.randrange(users), text=text, limit=20)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            print(f"{name:20} {timings[len(timings) // 2]:8.2f} {timings[int(len(timings) * 0.99)]:8.2f}")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "search.db")
+        load(path, args.tasks, args.users)
+        asyncio.run(measure(path, args.users, args.samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+SQL statements and latency per task update/delete: the previous
+select-mutate-commit-refresh flow vs. single UPDATE/DELETE ... RETURNING.
+
+Runs TaskService against a scratch SQLite database:
+
+    python benchmarks/task_write_statements.py -n 2000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+TASK_SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "task_service")
+
+
+class StatementCounter:
+    def __init__(self):
+        self.statements = 0
+
+    def __call__(self, *args):
+        self.statements += 1
+
+
+async def previous_update(service, task_id: int, user_id: int):
+    """
+    TaskService.update_task before it used UPDATE ... RETURNING
+    """
+    task = await service.get_task_by_id(user_id, task_id)
+    task.status = "completed"
+    await service.db.commit()
+    await service.db.refresh(task)
+    return task
+
+
+async def previous_delete(service, task_id: int, user_id: int):
+    """
+    TaskService.delete_task before it used DELETE ... RETURNING
+    (with the missing await on session.delete() restored)
+    """
+    task = await service.get_task_by_id(user_id, task_id)
+    await service.db.delete(task)
+    await service.db.commit()
+
+
+async def measure(session_factory, counter: StatementCounter, operation, task_ids) -> tuple[float, float]:
+    from services.task_service import TaskService
+
+    counter.statements = 0
+    started = time.perf_counter()
+    for task_id in task_ids:
+        async with session_factory() as db:
+            await operation(TaskService(db), task_id)
+    elapsed = time.perf_counter() - started
+    return counter.statements / len(task_ids), elapsed / len(task_ids) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(scratch, 'writes.db')}"
+    sys.path.insert(0, TASK_SERVICE_DIR)
+    from sqlalchemy import event, insert
+    from core.database import Base, SessionLocal, engine
+    from models.task_profile import Task
+
+    engine.echo = False
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Task), [
+            {"title": f"task {i}", "description": "", "status": "pending", "user_id": 1}
+            for i in range(4 * args.requests)
+        ])
+
+    # Every statement sent to the database, plus each COMMIT
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    event.listen(engine.sync_engine, "commit", counter)
+
+    n = args.requests
+    cases = [
+        ("update, previous", lambda s, i: previous_update(s, i, 1), range(1, n + 1)),
+        ("update, RETURNING", lambda s, i: s.update_task(id=i, user_id=1, status="completed"), range(n + 1, 2 * n + 1)),
+        ("delete, previous", lambda s, i: previous_delete(s, i, 1), range(2 * n + 1, 3 * n + 1)),
+        ("delete, RETURNING", lambda s, i: s.delete_task(user_id=1, id=i), range(3 * n + 1, 4 * n + 1)),
+    ]
+    print(f"{'':20} {'statements/request':>19} {'ms/request':>11}")
+    for name, operation, task_ids in cases:
+        statements, ms = await measure(SessionLocal, counter, operation, list(task_ids))
+        print(f"{name:20} {statements:19.1f} {ms:11.3f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
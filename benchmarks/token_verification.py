@@ -0,0 +1,61 @@
+"""
+Compare local (in-process) and remote (auth_service) token verification.
+
+Needs a running auth_service and a token issued by it:
+
+    python benchmarks/token_verification.py --token <access_token> --secret <SECRET_KEY>
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+TASK_SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "task_service")
+
+
+async def run(verify, token: str, requests: int, concurrency: int) -> float:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with limit:
+            await verify(token)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--secret", required=True, help="SECRET_KEY of auth_service")
+    parser.add_argument("--auth-url", default="http://localhost:8001")
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("-c", "--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ.update({
+        "AUTH_SERVICE_URL": args.auth_url,
+        "JWT_SECRET_KEY": args.secret,
+        "TOKEN_VERIFICATION": "local",
+        "REVOCATION_REFRESH_SECONDS": "0",
+    })
+    sys.path.insert(0, TASK_SERVICE_DIR)
+    from core.token_verifier import token_verifier
+
+    await token_verifier.start()
+    try:
+        for name, verify in (("remote", token_verifier.verify_remote), ("local", token_verifier.verify)):
+            await verify(args.token)  # Warm up (and fail early on a bad token)
+            elapsed = await run(verify, args.token, args.requests, args.concurrency)
+            print(
+                f"{name:>6}: {args.requests} verifications in {elapsed:.3f}s "
+                f"({args.requests / elapsed:,.0f}/s, {elapsed / args.requests * 1e6:,.1f} us avg)"
+            )
+    finally:
+        await token_verifier.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
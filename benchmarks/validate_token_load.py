@@ -0,0 +1,57 @@
+"""
+Concurrency benchmark for POST /auth/validate-token.
+
+Run it against auth_service before and after a change and compare:
+
+    python benchmarks/validate_token_load.py --token <access_token> -n 5000 -c 100
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--url", default="http://localhost:8001/auth/validate-token")
+    parser.add_argument("-n", "--requests", type=int, default=5000)
+    parser.add_argument("-c", "--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    latencies: list[float] = []
+    errors = 0
+    limit = asyncio.Semaphore(args.concurrency)
+    headers = {"Authorization": f"Bearer {args.token}"}
+
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=args.concurrency), timeout=30.0) as client:
+
+        async def one():
+            nonlocal errors
+            async with limit:
+                started = time.perf_counter()
+                try:
+                    resp = await client.post(args.url, headers=headers)
+                    if resp.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"requests:    {args.requests} (concurrency {args.concurrency}), errors: {errors}")
+    print(f"throughput:  {args.requests / elapsed:,.0f} req/s")
+    print(
+        f"latency ms:  p50 {quantiles[49] * 1000:.1f}  p95 {quantiles[94] * 1000:.1f}  "
+        f"p99 {quantiles[98] * 1000:.1f}  max {max(latencies) * 1000:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,6 @@
+"""
+Code shared by the services (token verification, Bloom filter).
+
+Services run from their own directories, so each one adds the repository
+root to sys.path before importing from here.
+"""
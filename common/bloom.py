@@ -0,0 +1,52 @@
+import base64
+import hashlib
+import math
+import zlib
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings (token `jti`s).
+    Bit positions come from double hashing of SHA-256, so a filter built by
+    auth_service can be serialized and read by any other service.
+    No false negatives; false positives at roughly the configured rate.
+    """
+
+    def __init__(self, size_bits: int, hash_count: int, bits: bytes | None = None):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.bits = bytearray(bits) if bits is not None else bytearray((size_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float) -> "BloomFilter":
+        size_bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        hash_count = max(1, round(size_bits / capacity * math.log(2)))
+        return cls(size_bits, hash_count)
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return ((h1 + i * h2) % self.size_bits for i in range(self.hash_count))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    # ---------------- SERIALIZATION ----------------
+    def to_dict(self) -> dict:
+        # Sparse filters compress very well
+        return {
+            "size_bits": self.size_bits,
+            "hash_count": self.hash_count,
+            "encoding": "zlib+base64",
+            "bits": base64.b64encode(zlib.compress(bytes(self.bits))).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BloomFilter":
+        bits = zlib.decompress(base64.b64decode(data["bits"]))
+        return cls(data["size_bits"], data["hash_count"], bits)
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import re
+import time
+import zlib
+
+import httpx
+import jwt
+from fastapi import HTTPException, status
+
+from common.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+LOCAL = "local"
+REMOTE = "remote"
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "EdDSA"}
+
+
+class JWKSCache:
+    """
+    Public keys from auth_service's JWKS endpoint, cached for the response's
+    Cache-Control max-age. An unknown `kid` (key rotation) triggers a refetch,
+    at most once per `min_refresh` seconds; stale keys are kept if auth_service
+    can't be reached.
+    """
+
+    def __init__(self, url: str, default_ttl: float, min_refresh: float):
+        self.url = url
+        self.default_ttl = default_ttl
+        self.min_refresh = min_refresh
+        self._keys: dict = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get_key(self, client: httpx.AsyncClient, kid: str):
+        if self._fresh() and kid in self._keys:
+            return self._keys[kid]
+
+        async with self._lock:
+            # Expired cache: refetch. Unknown kid: refetch unless we just did.
+            unknown = kid not in self._keys and time.monotonic() - self._fetched_at >= self.min_refresh
+            if not self._fresh() or unknown:
+                await self.refresh(client)
+        return self._keys.get(kid)
+
+    def _fresh(self) -> bool:
+        return time.monotonic() < self._expires_at
+
+    async def refresh(self, client: httpx.AsyncClient):
+        self._fetched_at = time.monotonic()
+        try:
+            resp = await client.get(self.url)
+            resp.raise_for_status()
+            keys = {}
+            for jwk in resp.json().get("keys", []):
+                key = jwt.PyJWK(jwk)
+                keys[key.key_id] = key.key
+        except (httpx.HTTPError, ValueError, jwt.PyJWTError) as e:
+            # Keep serving the keys we have; retry after min_refresh
+            logger.warning("Failed to fetch JWKS from %s: %s", self.url, e)
+            self._expires_at = time.monotonic() + self.min_refresh
+            return
+
+        self._keys = keys
+        self._expires_at = time.monotonic() + self._max_age(resp.headers.get("cache-control"))
+
+    def _max_age(self, cache_control: str | None) -> float:
+        match = re.search(r"max-age=(\d+)", cache_control or "")
+        return float(match.group(1)) if match else self.default_ttl
+
+
+class TokenVerifier:
+    """
+    Verifies access tokens in-process (signature, expiry, claims) when
+    TOKEN_VERIFICATION is "local", or by calling auth_service when "remote".
+    With an asymmetric JWT_ALGORITHM, public keys come from auth_service's JWKS.
+    In local mode, revoked users and tokens are pulled periodically from
+    auth_service's revocation feed (a Bloom filter snapshot plus deltas) and
+    rejected without a network call per request.
+
+    `settings` is the service's own Settings (TOKEN_VERIFICATION, JWT_*,
+    JWKS_*, REVOCATION_* and AUTH_SERVICE_URL).
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.jwks = JWKSCache(
+            self.settings.JWKS_URL or f"{self.settings.AUTH_SERVICE_URL}/.well-known/jwks.json",
+            default_ttl=self.settings.JWKS_DEFAULT_TTL,
+            min_refresh=self.settings.JWKS_MIN_REFRESH_SECONDS,
+        )
+        self.revoked_user_ids: set[int] = set()
+        self.revoked_bloom: BloomFilter | None = None  # Every revoked jti up to the snapshot
+        self.revoked_jtis: set[str] = set()  # Exact deltas since the snapshot
+        self.revocation_version = 0
+        self.revoked_user_version = 0
+        self._snapshot_at = 0.0
+        self._client: httpx.AsyncClient | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    # ---------------- LIFECYCLE ----------------
+    async def start(self):
+        asymmetric = self.settings.JWT_ALGORITHM in ASYMMETRIC_ALGORITHMS
+        if self.settings.TOKEN_VERIFICATION == LOCAL and not asymmetric and not self.settings.JWT_SECRET_KEY:
+            raise RuntimeError("JWT_SECRET_KEY must be set for local token verification")
+
+        self._client = httpx.AsyncClient(base_url=self.settings.AUTH_SERVICE_URL, timeout=5.0)
+        if self.settings.TOKEN_VERIFICATION == LOCAL and asymmetric:
+            await self.jwks.refresh(self._client)
+        if self.settings.TOKEN_VERIFICATION == LOCAL and self.settings.REVOCATION_REFRESH_SECONDS > 0:
+            await self.refresh_revocations()
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    # ---------------- VERIFICATION ----------------
+    async def verify(self, token: str) -> dict:
+        """
+        Return {"id": ..., "email": ...} for a valid token, raise 401 otherwise
+        """
+        if self.settings.TOKEN_VERIFICATION != LOCAL:
+            return await self.verify_remote(token)
+
+        try:
+            return await self.verify_local(token)
+        except HTTPException:
+            if self.settings.REMOTE_VALIDATION_FALLBACK:
+                return await self.verify_remote(token)
+            raise
+
+    async def verify_local(self, token: str) -> dict:
+        try:
+            payload = jwt.decode(
+                token,
+                await self._verification_key(token),
+                algorithms=[self.settings.JWT_ALGORITHM],
+                options={"require": ["exp", "sub"]},
+                leeway=self.settings.JWT_LEEWAY_SECONDS,
+            )
+            user_id = int(payload["sub"])
+        except jwt.ExpiredSignatureError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token expired",
+            )
+        except (jwt.InvalidTokenError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token",
+            )
+
+        jti = payload.get("jti")
+        if user_id in self.revoked_user_ids or (jti and jti in self.revoked_jtis):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token revoked",
+            )
+        if jti and self.revoked_bloom is not None and jti in self.revoked_bloom:
+            # Possibly revoked (or a Bloom false positive): let auth_service decide
+            return await self.verify_remote(token)
+        return {"id": user_id, "email": payload.get("email")}
+
+    async def _verification_key(self, token: str):
+        if self.settings.JWT_ALGORITHM not in ASYMMETRIC_ALGORITHMS:
+            return self.settings.JWT_SECRET_KEY
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = await self.jwks.get_key(self._client, kid) if kid else None
+        if key is None:
+            raise jwt.InvalidTokenError("Unknown signing key")
+        return key
+
+    async def verify_remote(self, token: str) -> dict:
+        try:
+            resp = await self._client.post(
+                "/auth/validate-token",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+        except httpx.RequestError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Auth service unavailable",
+            )
+
+        if resp.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token",
+            )
+
+        data = resp.json()
+        # Auth service returns {"user_id": ..., "email": ...}
+        auth_id = data.get("user_id") or data.get("id")
+        return {"id": auth_id, "email": data.get("email")}
+
+    # ---------------- REVOCATION FEED ----------------
+    async def refresh_revocations(self):
+        """
+        Fetch only the revocations since our version; re-download the full
+        snapshot every REVOCATION_SNAPSHOT_SECONDS or when auth_service asks for it
+        """
+        try:
+            snapshot_age = time.monotonic() - self._snapshot_at
+            if self.revoked_bloom is None or snapshot_age >= self.settings.REVOCATION_SNAPSHOT_SECONDS:
+                await self._load_revocation_snapshot()
+                return
+
+            resp = await self._client.get(
+                "/auth/revocations",
+                params={"since": self.revocation_version, "users_since": self.revoked_user_version},
+            )
+            resp.raise_for_status()
+            feed = resp.json()
+            if feed.get("snapshot_required"):
+                await self._load_revocation_snapshot()
+                return
+
+            self.revoked_jtis.update(feed.get("jtis", []))
+            self.revocation_version = feed["version"]
+            self.revoked_user_ids.update(feed.get("revoked_user_ids", []))
+            self.revoked_user_version = feed["user_version"]
+        except (httpx.HTTPError, ValueError, KeyError, zlib.error) as e:
+            # Keep the last known state; auth_service may be briefly unavailable
+            logger.warning("Failed to refresh token revocations: %s", e)
+
+    async def _load_revocation_snapshot(self):
+        resp = await self._client.get("/auth/revocations/snapshot")
+        resp.raise_for_status()
+        snapshot = resp.json()
+        self.revoked_bloom = BloomFilter.from_dict(snapshot["bloom"])
+        self.revoked_jtis = set()
+        self.revocation_version = snapshot["version"]
+        self.revoked_user_ids = set(snapshot.get("revoked_user_ids", []))
+        self.revoked_user_version = snapshot["user_version"]
+        self._snapshot_at = time.monotonic()
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.settings.REVOCATION_REFRESH_SECONDS)
+            await self.refresh_revocations()
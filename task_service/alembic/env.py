@@ -20,6 +20,11 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata  # your models
 
+
+def include_name(name, type_, parent_names):
+    # Keep autogenerate away from the FTS5 table and its shadow tables (tasks_fts_*)
+    return not (type_ == "table" and name.startswith("tasks_fts"))
+
 # ----------------- OFFLINE MODE -----------------
 def run_migrations_offline():
     url = config.get_main_option("sqlalchemy.url")
@@ -39,7 +44,7 @@ def run_migrations_online():
     connectable = sync_engine  # use the sync engine
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(connection=connection, target_metadata=target_metadata, include_name=include_name)
 
         with context.begin_transaction():
             context.run_migrations()
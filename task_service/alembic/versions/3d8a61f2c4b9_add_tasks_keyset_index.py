@@ -0,0 +1,28 @@
+"""add tasks keyset pagination index
+
+Revision ID: 3d8a61f2c4b9
+Revises: 0cbb37a67d38
+Create Date: 2026-10-18 10:12:31.408215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d8a61f2c4b9'
+down_revision: Union[str, Sequence[str], None] = '0cbb37a67d38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_user_id_created_at_id', 'tasks', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user_id_created_at_id', table_name='tasks')
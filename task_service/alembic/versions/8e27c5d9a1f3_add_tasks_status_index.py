@@ -0,0 +1,28 @@
+"""add tasks status listing index
+
+Revision ID: 8e27c5d9a1f3
+Revises: 3d8a61f2c4b9
+Create Date: 2026-10-18 11:03:54.916027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e27c5d9a1f3'
+down_revision: Union[str, Sequence[str], None] = '3d8a61f2c4b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_user_id_status_created_at_id', 'tasks', ['user_id', 'status', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user_id_status_created_at_id', table_name='tasks')
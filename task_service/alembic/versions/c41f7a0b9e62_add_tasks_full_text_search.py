@@ -0,0 +1,64 @@
+"""add tasks full-text search
+
+Revision ID: c41f7a0b9e62
+Revises: 8e27c5d9a1f3
+Create Date: 2026-10-18 13:41:07.220583
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f7a0b9e62'
+down_revision: Union[str, Sequence[str], None] = '8e27c5d9a1f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return  # FTS5 is SQLite only
+
+    op.execute(
+        "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+        "owner, title, description, content='', tokenize='porter unicode61')"
+    )
+    op.execute(
+        "INSERT INTO tasks_fts (rowid, owner, title, description) "
+        "SELECT id, 'u' || user_id, title, coalesce(description, '') FROM tasks"
+    )
+    op.execute("""
+        CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, owner, title, description)
+            VALUES (new.id, 'u' || new.user_id, new.title, coalesce(new.description, ''));
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, owner, title, description)
+            VALUES ('delete', old.id, 'u' || old.user_id, old.title, coalesce(old.description, ''));
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description, user_id ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, owner, title, description)
+            VALUES ('delete', old.id, 'u' || old.user_id, old.title, coalesce(old.description, ''));
+            INSERT INTO tasks_fts (rowid, owner, title, description)
+            VALUES (new.id, 'u' || new.user_id, new.title, coalesce(new.description, ''));
+        END
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS tasks_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS tasks_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS tasks_fts_insert")
+    op.execute("DROP TABLE IF EXISTS tasks_fts")
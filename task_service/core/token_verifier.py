@@ -0,0 +1,10 @@
+import os
+import sys
+
+# common/ lives at the repository root, next to this service's directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.token_verifier import TokenVerifier  # noqa: E402
+from core.config import settings  # noqa: E402
+
+token_verifier = TokenVerifier(settings)
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from routers import task
 from core.database import Base, engine
+from core.token_verifier import token_verifier
 
 app = FastAPI(title="Task Service")
 app.include_router(task.router)
@@ -9,6 +10,12 @@ app.include_router(task.router)
 async def startup():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    await token_verifier.start()
 
 # Check if table exists
-# If not → create it
\ No newline at end of file
+# If not → create it
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await token_verifier.stop()
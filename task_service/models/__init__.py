@@ -1,3 +1,4 @@
 from .task_profile import Task
+from . import task_search
 
 __all__ = ["Task"]
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -13,5 +14,16 @@ class Task(Base):
     description = Column(Text, nullable=True)
     status = Column(String, default="pending")
     user_id = Column(Integer, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # SQLite stores CURRENT_TIMESTAMP as "YYYY-MM-DD HH:MM:SS"; bind datetimes in
+    # the same format so created_at comparisons (filters, cursors) match by string
+    created_at = Column(
+        DateTime(timezone=True).with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite"),
+        server_default=func.now(),
+    )
 
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? AND (created_at, id) > (?, ?) ORDER BY created_at, id
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Listings filtered by status (and counts per status)
+        Index("ix_tasks_user_id_status_created_at_id", "user_id", "status", "created_at", "id"),
+    )
@@ -0,0 +1,39 @@
+from sqlalchemy import DDL, event
+
+from models.task_profile import Task
+
+# SQLite FTS5 index over task titles and descriptions (see alembic revision
+# c41f7a0b9e62). It is contentless: rows are read back from `tasks` by rowid.
+# `owner` holds a "u<user_id>" token so a search only intersects the postings
+# of one user's tasks instead of filtering every user's matches.
+TASK_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        owner, title, description, content='', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts (rowid, owner, title, description)
+        VALUES (new.id, 'u' || new.user_id, new.title, coalesce(new.description, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, owner, title, description)
+        VALUES ('delete', old.id, 'u' || old.user_id, old.title, coalesce(old.description, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description, user_id ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, owner, title, description)
+        VALUES ('delete', old.id, 'u' || old.user_id, old.title, coalesce(old.description, ''));
+        INSERT INTO tasks_fts (rowid, owner, title, description)
+        VALUES (new.id, 'u' || new.user_id, new.title, coalesce(new.description, ''));
+    END
+    """,
+]
+
+# Databases built with Base.metadata.create_all (main.py startup) get the index too
+for statement in TASK_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
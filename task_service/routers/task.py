@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-import httpx
-from typing import List
-from core.config import settings
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
 from core.database import get_db
+from core.token_verifier import token_verifier
 from services.task_service import TaskService
-from schemas.task import TaskResponse, TaskStatus, TaskCreate, TaskUpdate
+from core.config import settings
+from schemas.task import (
+    TaskResponse, TaskStatus, TaskCreate, TaskUpdate, SortOrder,
+    TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete, TaskBulkResult,
+)
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 security = HTTPBearer()
@@ -17,31 +22,9 @@ async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """
-    Validate token with auth service and return user info
+    Verify the token (in-process or via auth service) and return user info
     """
-    token = credentials.credentials
-    try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{settings.AUTH_SERVICE_URL}/auth/validate-token",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=5.0,
-            )
-    except httpx.RequestError:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Auth service unavailable",
-        )
-
-    if resp.status_code != 200:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-        )
-
-    data = resp.json()
-    auth_id = data.get("user_id") or data.get("id")
-    return {"id": auth_id, "email": data.get("email")}
+    return await token_verifier.verify(credentials.credentials)
 
 
 # ---------------- CREATE TASK ----------------
@@ -66,17 +49,41 @@ async def create_task(
 # ---------------- GET ALL TASKS ----------------
 @router.get("", response_model=List[TaskResponse])
 async def list_tasks(
+    request: Request,
+    response: Response,
     user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     offset: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    status_filter: Optional[TaskStatus] = Query(None, alias="status"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    order: SortOrder = SortOrder.asc,
 ):
     """
-    Get all tasks for the authenticated user with pagination
+    Get the authenticated user's tasks by creation time (oldest first unless
+    order=desc), optionally filtered by status and a created_at range
+    [created_after, created_before). The next page is linked from the
+    `Link: <...>; rel="next"` header.
     """
     try:
         service = TaskService(db)
-        return await service.get_task(user_id=user["id"], limit=limit, offset=offset)
+        tasks, next_cursor = await service.get_task(
+            user_id=user["id"],
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            status=status_filter.value if status_filter else None,
+            created_after=created_after,
+            created_before=created_before,
+            descending=order == SortOrder.desc,
+        )
+        if next_cursor:
+            next_params = {k: v for k, v in request.query_params.items() if k not in ("cursor", "offset")}
+            next_url = request.url.path + "?" + urlencode({**next_params, "cursor": next_cursor})
+            response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return tasks
     except HTTPException:
         raise
     except Exception:
@@ -86,6 +93,162 @@ async def list_tasks(
         )
 
 
+# ---------------- COUNT TASKS BY STATUS ----------------
+@router.get("/counts", response_model=Dict[str, int])
+async def count_tasks(
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Number of tasks per status for the authenticated user
+    """
+    try:
+        service = TaskService(db)
+        counts = {task_status.value: 0 for task_status in TaskStatus}
+        counts.update(await service.count_by_status(user_id=user["id"]))
+        return counts
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to count tasks",
+        )
+
+
+# ---------------- SEARCH ----------------
+@router.get("/search", response_model=List[TaskResponse])
+async def search_tasks(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=256),
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+):
+    """
+    Full-text search over the authenticated user's task titles and descriptions,
+    best match first. The next page is linked from the `Link: <...>; rel="next"` header.
+    """
+    try:
+        service = TaskService(db)
+        tasks, has_more = await service.search_tasks(user_id=user["id"], text=q, limit=limit, offset=offset)
+        if has_more:
+            next_params = {**request.query_params, "offset": offset + limit}
+            response.headers["Link"] = f'<{request.url.path}?{urlencode(next_params)}>; rel="next"'
+        return tasks
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search tasks",
+        )
+
+
+# ---------------- BULK (declared before /{task_id}) ----------------
+def _check_bulk_size(count: int):
+    if count > settings.MAX_BULK_TASKS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.MAX_BULK_TASKS} tasks per request",
+        )
+
+
+def _check_unique_ids(ids: List[int]):
+    if len(set(ids)) != len(ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each task id may appear only once",
+        )
+
+
+@router.post("/bulk", status_code=201, response_model=List[TaskBulkResult])
+async def create_tasks_bulk(
+    request: TaskBulkCreate,
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Create many tasks in one transaction; results are in request order
+    """
+    _check_bulk_size(len(request.tasks))
+    try:
+        service = TaskService(db)
+        tasks = await service.create_tasks(
+            user_id=user["id"],
+            items=[task.model_dump(mode="json") for task in request.tasks],
+        )
+        return [{"id": task.id, "status": "created", "task": task} for task in tasks]
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create tasks",
+        )
+
+
+@router.patch("/bulk", response_model=List[TaskBulkResult])
+async def update_tasks_bulk(
+    request: TaskBulkUpdate,
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Update many tasks in one transaction; unknown ids are reported as not_found
+    """
+    _check_bulk_size(len(request.tasks))
+    ids = [item.id for item in request.tasks]
+    _check_unique_ids(ids)
+    try:
+        service = TaskService(db)
+        updated = await service.update_tasks(
+            user_id=user["id"],
+            items=[item.model_dump(mode="json", exclude_unset=True) for item in request.tasks],
+        )
+        return [
+            {"id": task_id, "status": "updated", "task": updated[task_id]}
+            if task_id in updated else {"id": task_id, "status": "not_found"}
+            for task_id in ids
+        ]
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update tasks",
+        )
+
+
+@router.delete("/bulk", response_model=List[TaskBulkResult])
+async def delete_tasks_bulk(
+    request: TaskBulkDelete,
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Delete many tasks in one statement; unknown ids are reported as not_found
+    """
+    _check_bulk_size(len(request.ids))
+    _check_unique_ids(request.ids)
+    try:
+        service = TaskService(db)
+        deleted = await service.delete_tasks(user_id=user["id"], ids=request.ids)
+        return [
+            {"id": task_id, "status": "deleted" if task_id in deleted else "not_found"}
+            for task_id in request.ids
+        ]
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete tasks",
+        )
+
+
 # ---------------- GET TASK BY ID ----------------
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task_by_id(
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from enum import Enum
 
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class TaskStatus(str, Enum):
@@ -9,6 +9,10 @@ class TaskStatus(str, Enum):
     in_progress = "in_progress"
     completed = "completed"
 
+class SortOrder(str, Enum):
+    asc = "asc"
+    desc = "desc"
+
 class TaskCreate(BaseModel):
     title: str
     description: str
@@ -30,3 +34,19 @@ class TaskResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate]
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem]
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int]
+
+class TaskBulkResult(BaseModel):
+    id: int
+    status: str  # created / updated / deleted / not_found
+    task: Optional[TaskResponse] = None
@@ -1,8 +1,57 @@
-from sqlalchemy import select, update, delete as sql_delete
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, insert, update, delete as sql_delete, func, literal, literal_column, table, column, union_all
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from models.task_profile import Task
 
+
+# ---------------- CURSORS ----------------
+def encode_cursor(task: Task) -> str:
+    """
+    Opaque keyset cursor pointing just after `task` in (created_at, id) order
+    """
+    raw = json.dumps([task.id, task.created_at.isoformat() if task.created_at else None])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int, Optional[datetime]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        task_id, created_at = json.loads(raw)
+        return int(task_id), datetime.fromisoformat(created_at) if created_at else None
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# ---------------- SEARCH ----------------
+tasks_fts = table("tasks_fts", column("rowid"))
+_SEARCH_TERM = re.compile(r"\w+")
+
+
+def search_expression(user_id: int, text: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for the user's tasks containing every word of `text`.
+    Words are quoted, so user input can't inject FTS5 query syntax.
+    """
+    terms = _SEARCH_TERM.findall(text)
+    if not terms:
+        return None
+    words = " AND ".join(f'"{term}"' for term in terms)
+    return f"owner:u{user_id} AND {{title description}}:({words})"
+
+
+def _listing_order(created_at, id, descending: bool) -> tuple:
+    if descending:
+        return created_at.desc(), id.desc()
+    return created_at, id
+
+
 class TaskService:
     def __init__(self, db: AsyncSession):
         self.db = db    
@@ -14,12 +63,203 @@ class TaskService:
         await self.db.refresh(task)
         return task
 
-    async def get_task(self, user_id: int, limit: int = 10, offset: int = 0):
+    # ---------------- BULK ----------------
+    async def create_tasks(self, user_id: int, items: list[dict]) -> list[Task]:
+        """
+        Insert all tasks in one transaction (multi-row INSERT ... RETURNING)
+        """
+        if not items:
+            return []
+        try:
+            result = await self.db.scalars(
+                insert(Task).returning(Task, sort_by_parameter_order=True),
+                [{**item, "user_id": user_id} for item in items],
+            )
+            tasks = result.all()
+            await self.db.commit()
+            return tasks
+        except Exception:
+            await self.db.rollback()
+            raise
+
+    async def update_tasks(self, user_id: int, items: list[dict]) -> dict[int, Task]:
+        """
+        Apply per-task changes in one transaction. Items with identical changes
+        share a single UPDATE ... WHERE id IN (...) statement, so closing
+        hundreds of tasks is one round trip. Returns updated tasks by id;
+        ids that don't exist (or belong to someone else) are missing.
+        """
+        groups: dict[tuple, list[int]] = {}
+        for item in items:
+            changes = tuple(sorted((k, v) for k, v in item.items() if k != "id" and v is not None))
+            groups.setdefault(changes, []).append(item["id"])
+
+        updated = {}
+        try:
+            for changes, ids in groups.items():
+                if changes:
+                    query = (
+                        update(Task)
+                        .where(Task.user_id == user_id, Task.id.in_(ids))
+                        .values(**dict(changes))
+                        .returning(Task)
+                    )
+                else:
+                    query = select(Task).where(Task.user_id == user_id, Task.id.in_(ids))
+                for task in (await self.db.scalars(query)).all():
+                    updated[task.id] = task
+            await self.db.commit()
+            return updated
+        except Exception:
+            await self.db.rollback()
+            raise
+
+    async def delete_tasks(self, user_id: int, ids: list[int]) -> set[int]:
+        """
+        Delete the user's tasks among `ids` in one statement; returns the ids deleted
+        """
+        if not ids:
+            return set()
+        try:
+            result = await self.db.execute(
+                sql_delete(Task).where(Task.user_id == user_id, Task.id.in_(ids)).returning(Task.id)
+            )
+            deleted = set(result.scalars().all())
+            await self.db.commit()
+            return deleted
+        except Exception:
+            await self.db.rollback()
+            raise
+
+    # ---------------- SEARCH ----------------
+    async def search_tasks(self, user_id: int, text: str, limit: int = 10, offset: int = 0):
+        """
+        The user's tasks matching every word of `text`, best bm25 match first
+        (title matches weigh 10x description matches); returns (tasks, has_more)
+        """
+        expression = search_expression(user_id, text)
+        if expression is None:
+            return [], False
+
         result = await self.db.execute(
-            select(Task).where(Task.user_id == user_id).limit(limit).offset(offset)
+            select(Task)
+            .join(tasks_fts, tasks_fts.c.rowid == Task.id)
+            .where(literal_column("tasks_fts").op("MATCH")(expression), Task.user_id == user_id)
+            .order_by(func.bm25(literal_column("tasks_fts"), 0.0, 10.0, 1.0), Task.id)
+            .limit(limit + 1)
+            .offset(offset)
         )
         tasks = result.scalars().all()
-        return tasks
+        return tasks[:limit], len(tasks) > limit
+
+    # ---------------- LISTING ----------------
+    async def get_task(
+        self,
+        user_id: int,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        descending: bool = False,
+    ):
+        """
+        One page of the user's tasks in (created_at, id) order and the cursor of
+        the next page (None on the last page). With a cursor the query seeks
+        through the (user_id[, status], created_at, id) indexes, so every page
+        costs the same; `offset` is only honoured without a cursor.
+        """
+        query = self.list_query(user_id, limit + 1, offset, cursor, status, created_after, created_before, descending)
+        result = await self.db.execute(query)
+        tasks = result.scalars().all()
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            return tasks, encode_cursor(tasks[-1])
+        return tasks, None
+
+    def list_query(
+        self,
+        user_id: int,
+        limit: int,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        descending: bool = False,
+    ):
+        """
+        SELECT for one listing page (also used by benchmarks/task_query_plans.py)
+        """
+        filters = [Task.user_id == user_id]
+        if status is not None:
+            filters.append(Task.status == status)
+
+        if cursor:
+            return self._after_cursor(user_id, cursor, limit, filters, created_after, created_before, descending)
+
+        if created_after is not None:
+            filters.append(Task.created_at >= created_after)
+        if created_before is not None:
+            filters.append(Task.created_at < created_before)
+        query = select(Task).where(*filters).order_by(*_listing_order(Task.created_at, Task.id, descending)).limit(limit)
+        if offset:
+            query = query.offset(offset)
+        return query
+
+    def _after_cursor(
+        self,
+        user_id: int,
+        cursor: str,
+        limit: int,
+        filters: list,
+        created_after: Optional[datetime],
+        created_before: Optional[datetime],
+        descending: bool,
+    ):
+        """
+        Tasks after the cursor in listing order. Written as two index seeks --
+        the rest of the cursor's created_at, then later (or earlier, descending)
+        created_at -- because a row-value `(created_at, id) > (?, ?)` only seeks
+        on created_at and would walk every task sharing the cursor's timestamp.
+        The created_at range is applied to the merged page, so it can't pull the
+        first seek off the `created_at = anchor` index prefix.
+        """
+        after_id, after_created_at = decode_cursor(cursor)
+        # The stored created_at is exact; the decoded one is a fallback for when
+        # the cursor task has since been deleted
+        anchor = func.coalesce(
+            select(Task.created_at).where(Task.id == after_id, Task.user_id == user_id).scalar_subquery(),
+            literal(after_created_at, Task.created_at.type),
+        )
+        same_time = (
+            select(Task)
+            .where(*filters, Task.created_at == anchor, Task.id < after_id if descending else Task.id > after_id)
+            .order_by(Task.id.desc() if descending else Task.id)
+            .limit(limit)
+            .subquery()
+        )
+        later = (
+            select(Task)
+            .where(*filters, Task.created_at < anchor if descending else Task.created_at > anchor)
+            .order_by(*_listing_order(Task.created_at, Task.id, descending))
+            .limit(limit)
+            .subquery()
+        )
+        page = union_all(select(same_time), select(later)).subquery()
+        query = select(aliased(Task, page))
+        if created_after is not None:
+            query = query.where(page.c.created_at >= created_after)
+        if created_before is not None:
+            query = query.where(page.c.created_at < created_before)
+        return query.order_by(*_listing_order(page.c.created_at, page.c.id, descending)).limit(limit)
+
+    async def count_by_status(self, user_id: int):
+        result = await self.db.execute(
+            select(Task.status, func.count(Task.id)).where(Task.user_id == user_id).group_by(Task.status)
+        )
+        return {status: count for status, count in result.all()}
 
     async def get_task_by_id(self, user_id: int, id: int):
         result = await self.db.execute(
@@ -31,20 +271,36 @@ class TaskService:
         return task
 
     async def update_task(self, id: int, user_id: int, title: str = None, description: str = None, status: str = None):
-        task = await self.get_task_by_id(user_id, id)
-        if title is not None:
-            task.title = title
-        if description is not None:
-            task.description = description
-        if status is not None:
-            task.status = status
+        """
+        Single UPDATE ... WHERE id = ? AND user_id = ? RETURNING; 404 if no row matched
+        """
+        changes = {
+            field: value
+            for field, value in (("title", title), ("description", description), ("status", status))
+            if value is not None
+        }
+        if not changes:
+            return await self.get_task_by_id(user_id, id)
+
+        result = await self.db.scalars(
+            update(Task).where(Task.id == id, Task.user_id == user_id).values(**changes).returning(Task)
+        )
+        task = result.one_or_none()
+        if not task:
+            await self.db.rollback()
+            raise HTTPException(status_code=404, detail=f"No task with id {id} found")
         await self.db.commit()
-        await self.db.refresh(task)
         return task
 
     async def delete_task(self, user_id: int, id: int):
-        task = await self.get_task_by_id(user_id, id)
-        # Delete using session.delete() which is synchronous
-        self.db.delete(task)
+        """
+        Single DELETE ... WHERE id = ? AND user_id = ? RETURNING id; 404 if no row matched
+        """
+        result = await self.db.execute(
+            sql_delete(Task).where(Task.id == id, Task.user_id == user_id).returning(Task.id)
+        )
+        if result.scalar_one_or_none() is None:
+            await self.db.rollback()
+            raise HTTPException(status_code=404, detail=f"No task with id {id} found")
         await self.db.commit()
         return {"message": "Task deleted successfully", "task_id": id}
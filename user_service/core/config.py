@@ -4,6 +4,23 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite+aiosqlite:///./user_service.db"
     AUTH_SERVICE_URL: str = "http://localhost:8001"
 
+    # Token verification: "local" checks signature, expiry and claims in-process
+    # (JWT_SECRET_KEY must match auth_service, or use RS256/EdDSA public keys from
+    # the JWKS endpoint), "remote" asks auth_service per request
+    TOKEN_VERIFICATION: str = "remote"
+    JWT_SECRET_KEY: str | None = None
+    JWT_ALGORITHM: str = "HS256"
+    JWKS_URL: str | None = None  # Defaults to AUTH_SERVICE_URL + /.well-known/jwks.json
+    JWKS_DEFAULT_TTL: float = 300.0  # Used when the JWKS response has no max-age
+    JWKS_MIN_REFRESH_SECONDS: float = 10.0
+    JWT_LEEWAY_SECONDS: int = 0
+    # In local mode, ask auth_service when a token can't be verified locally
+    REMOTE_VALIDATION_FALLBACK: bool = False
+    # How often (seconds) revocations are pulled from auth_service; 0 disables
+    REVOCATION_REFRESH_SECONDS: float = 30.0
+    # How often the full revocation Bloom filter is re-downloaded (deltas in between)
+    REVOCATION_SNAPSHOT_SECONDS: float = 3600.0
+
     class Config:
         env_file = ".env"
 
@@ -1,10 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-import httpx
 
-from core.config import settings
 from core.database import get_db
+from core.token_verifier import token_verifier
 from services.user_service import UserService
 from schemas.user import UserRead
 
@@ -16,34 +15,11 @@ security = HTTPBearer()
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
-    token = credentials.credentials
-
-    try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{settings.AUTH_SERVICE_URL}/auth/validate-token",
-                headers={"Authorization": f"Bearer {token}"},
-                timeout=5.0,
-            )
-
-    except httpx.RequestError:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Auth service unavailable",
-        )
-
-    if resp.status_code != 200:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-        )
-
-    data = resp.json()
-
-    # Normalize contract (VERY IMPORTANT in microservices)
-    # Auth service returns {"user_id": ..., "email": ...}
-    auth_id = data.get("user_id") or data.get("id")
-    return {"id": auth_id, "email": data.get("email")}
+    """
+    Verify the token (in-process or via auth service) and return user info.
+    Normalized contract: {"id": ..., "email": ...}
+    """
+    return await token_verifier.verify(credentials.credentials)
 
 
 # ---------------- GET OWN PROFILE ----------------